@@ -0,0 +1,17 @@
+"""Gunicorn configuration for the eInk InfoDisplay web interface
+
+src/web_app.py execs gunicorn with this file when it is installed; it
+can also be launched directly:
+
+    gunicorn -c gunicorn.conf.py src.web_app:app
+
+Thread workers rather than gevent: the app's caches, journal reader and
+D-Bus handles are guarded by threading locks, and a single process
+keeps exactly one EInkDisplayManager talking to the panel. Throughput
+for the polling endpoints scales with the thread count.
+"""
+bind = "0.0.0.0:8080"
+workers = 1
+worker_class = "gthread"
+threads = 8
+timeout = 60
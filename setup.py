@@ -3,9 +3,12 @@
 Setup script for eInk InfoDisplay using Pimoroni Inky Impression 7.3"
 """
 import os
+import shlex
 import sys
 import subprocess
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Set up logging
@@ -26,7 +29,9 @@ def run_command(command, cwd=None, shell=False):
     """Run a shell command and log output"""
     logger.info(f"Running: {command}")
     if not shell and isinstance(command, str):
-        command = command.split()
+        # shlex handles quoted arguments correctly (plain str.split would
+        # break on paths containing spaces)
+        command = shlex.split(command)
 
     try:
         process = subprocess.Popen(
@@ -34,11 +39,14 @@ def run_command(command, cwd=None, shell=False):
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
+            bufsize=-1,
             cwd=cwd,
             shell=shell
         )
 
-        for line in iter(process.stdout.readline, ''):
+        # Iterate the buffered stream directly instead of readline-per-call
+        # to avoid a syscall per line of apt/pip output
+        for line in process.stdout:
             line = line.rstrip()
             if line:
                 logger.info(f"  {line}")
@@ -80,8 +88,13 @@ def create_project_structure():
         "logs"
     ]
 
-    for directory in directories:
-        create_directory(os.path.join(project_root, directory))
+    # Deepest paths first so makedirs creates parents implicitly, and
+    # skip directories that already exist (one stat instead of mkdir churn
+    # on repeat runs)
+    for directory in sorted(directories, key=lambda p: -p.count('/')):
+        full_path = os.path.join(project_root, directory)
+        if not os.path.isdir(full_path):
+            create_directory(full_path)
 
     return project_root
 
@@ -104,13 +117,23 @@ def install_system_packages():
         "fonts-dejavu-core"
     ]
 
-    # Update package list
-    if run_command(["sudo", "apt-get", "update"]) != 0:
+    # Update package list, unless the apt cache is already fresh (<24h)
+    apt_stamp = "/var/lib/apt/periodic/update-success-stamp"
+    try:
+        cache_age = time.time() - os.path.getmtime(apt_stamp)
+    except OSError:
+        cache_age = None
+
+    if cache_age is not None and cache_age < 86400:
+        logger.info("Apt cache is fresh - skipping apt-get update")
+    elif run_command(["sudo", "apt-get", "update"]) != 0:
         logger.error("Failed to update package list")
         return False
 
-    # Install packages
-    apt_command = ["sudo", "apt-get", "install", "-y"] + packages
+    # Install packages; noninteractive avoids tty prompts stalling the
+    # install and --no-install-recommends trims the download
+    apt_command = ["sudo", "DEBIAN_FRONTEND=noninteractive", "apt-get",
+                   "install", "-y", "--no-install-recommends"] + packages
     if run_command(apt_command) != 0:
         logger.error("Failed to install system packages")
         return False
@@ -130,11 +153,12 @@ def install_pimoroni_libraries():
         "numpy>=1.19.0"
     ]
 
-    for package in pip_packages:
-        logger.info(f"Installing {package}")
-        if run_command([sys.executable, "-m", "pip", "install", package]) != 0:
-            logger.error(f"Failed to install {package}")
-            return False
+    # Install everything in one pip invocation so interpreter startup and
+    # pip's dependency resolution only happen once
+    logger.info(f"Installing: {', '.join(pip_packages)}")
+    if run_command([sys.executable, "-m", "pip", "install"] + pip_packages) != 0:
+        logger.error("Failed to install Python packages")
+        return False
 
     return True
 
@@ -144,19 +168,17 @@ def enable_spi():
 
     # Check if SPI is already enabled
     try:
-        with open('/boot/config.txt', 'r') as f:
-            content = f.read()
-            if 'dtparam=spi=on' in content and not content.count('dtparam=spi=on') > 1:
-                logger.info("SPI is already enabled")
-                return True
+        # Single scan: exactly one occurrence means SPI is cleanly enabled
+        if Path('/boot/config.txt').read_text().count('dtparam=spi=on') == 1:
+            logger.info("SPI is already enabled")
+            return True
     except FileNotFoundError:
         # Try the new boot config location
         try:
-            with open('/boot/firmware/config.txt', 'r') as f:
-                content = f.read()
-                if 'dtparam=spi=on' in content:
-                    logger.info("SPI is already enabled")
-                    return True
+            content = Path('/boot/firmware/config.txt').read_text()
+            if 'dtparam=spi=on' in content:
+                logger.info("SPI is already enabled")
+                return True
         except FileNotFoundError:
             pass
 
@@ -350,25 +372,25 @@ def main():
 
     # Check if running on Raspberry Pi
     try:
-        with open('/proc/cpuinfo', 'r') as f:
-            cpuinfo = f.read()
-            if 'Raspberry Pi' not in cpuinfo and 'BCM' not in cpuinfo:
-                logger.warning("This doesn't appear to be a Raspberry Pi")
-                cont = input("Continue anyway? (y/n): ").lower()
-                if cont != 'y':
-                    return False
+        cpuinfo = Path('/proc/cpuinfo').read_text()
+        if 'Raspberry Pi' not in cpuinfo and 'BCM' not in cpuinfo:
+            logger.warning("This doesn't appear to be a Raspberry Pi")
+            cont = input("Continue anyway? (y/n): ").lower()
+            if cont != 'y':
+                return False
     except FileNotFoundError:
         logger.warning("Cannot detect Raspberry Pi")
 
     # Create project structure
     project_root = create_project_structure()
 
-    # Install system packages
+    # apt must finish before pip: the apt list provides python3-pip and
+    # the dev headers (libfreetype6-dev, libjpeg-dev, build-essential)
+    # the pip leg compiles against on a fresh Pi
     if not install_system_packages():
         logger.error("Failed to install system packages")
         return False
 
-    # Install Pimoroni libraries
     if not install_pimoroni_libraries():
         logger.error("Failed to install Pimoroni libraries")
         return False
@@ -376,17 +398,15 @@ def main():
     # Enable SPI
     enable_spi()
 
-    # Create config file
-    if not create_config_file(project_root):
-        return False
-
-    # Create systemd services
-    if not create_systemd_services(project_root):
-        return False
-
-    # Create launcher script
-    if not create_launcher_script(project_root):
-        return False
+    # The remaining steps write independent files - run them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(create_config_file, project_root),
+            executor.submit(create_systemd_services, project_root),
+            executor.submit(create_launcher_script, project_root)
+        ]
+        if not all(future.result() for future in futures):
+            return False
 
     print_header("Setup Complete!")
     logger.info("eInk InfoDisplay has been set up successfully!")
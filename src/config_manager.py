@@ -4,10 +4,67 @@ Configuration Manager for eInk InfoDisplay
 """
 import json
 import logging
+import os
+from copy import deepcopy
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Default configuration, built once at import. _create_default_config
+# hands out deep copies so callers can mutate their config freely.
+_DEFAULT_CONFIG = {
+    "display": {
+        "type": "inky_impression",
+        "width": 800,
+        "height": 480,
+        "color": "7color",
+        "update_interval": 300,
+        "rotation": 0
+    },
+    "api_keys": {
+        "openweathermap": "",
+        "finnhub": ""
+    },
+    "plugins": {
+        "enabled": ["clock", "weather", "prayer", "stock"],
+        "default": "clock",
+        "settings": {
+            "clock": {
+                "show_seconds": False,
+                "format_24h": True,
+                "timezone": "UTC"
+            },
+            "weather": {
+                "city_id": 4791160,
+                "units": "imperial",
+                "update_interval": 1800
+            },
+            "prayer": {
+                "latitude": 38.903481,
+                "longitude": -77.262817,
+                "method": 1,
+                "update_interval": 3600
+            },
+            "stock": {
+                "symbols": ["AAPL", "GOOGL", "MSFT"],
+                "api_key": "",
+                "update_interval": 1800
+            }
+        }
+    },
+    "web": {
+        "host": "0.0.0.0",
+        "port": 8080,
+        "debug": False
+    }
+}
+
 class ConfigManager:
     """Manages application configuration"""
     
@@ -19,79 +76,46 @@ class ConfigManager:
         """
         self.config_path = Path(config_path)
         self.config = {}
-        
+
+        # Cache for resolved nested lookups, keyed on the keys tuple.
+        # Cleared whenever the configuration is mutated or reloaded.
+        self._get_cache = {}
+
         # Load configuration
         self.load_config()
     
     def load_config(self):
         """Load configuration from file"""
         try:
-            if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    self.config = json.load(f)
-                logger.info(f"Configuration loaded from {self.config_path}")
-            else:
-                # Create default configuration
+            # Open directly rather than stat-then-open; a missing file is
+            # the signal to create the default configuration
+            try:
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
                 self.config = self._create_default_config()
                 self.save_config()
                 logger.info(f"Created default configuration at {self.config_path}")
-                
+            else:
+                if orjson is not None:
+                    self.config = orjson.loads(raw)
+                else:
+                    self.config = json.loads(raw)
+                logger.info(f"Configuration loaded from {self.config_path}")
+
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
             self.config = self._create_default_config()
+
+        self._get_cache.clear()
     
     def _create_default_config(self):
         """Create default configuration
-        
+
         Returns:
             Default configuration dictionary
         """
-        return {
-            "display": {
-                "type": "inky_impression",
-                "width": 800,
-                "height": 480,
-                "color": "7color",
-                "update_interval": 300,
-                "rotation": 0
-            },
-            "api_keys": {
-                "openweathermap": "",
-                "finnhub": ""
-            },
-            "plugins": {
-                "enabled": ["clock", "weather", "prayer", "stock"],
-                "default": "clock",
-                "settings": {
-                    "clock": {
-                        "show_seconds": False,
-                        "format_24h": True,
-                        "timezone": "UTC"
-                    },
-                    "weather": {
-                        "city_id": 4791160,
-                        "units": "imperial",
-                        "update_interval": 1800
-                    },
-                    "prayer": {
-                        "latitude": 38.903481,
-                        "longitude": -77.262817,
-                        "method": 1,
-                        "update_interval": 3600
-                    },
-                    "stock": {
-                        "symbols": ["AAPL", "GOOGL", "MSFT"],
-                        "api_key": "",
-                        "update_interval": 1800
-                    }
-                }
-            },
-            "web": {
-                "host": "0.0.0.0",
-                "port": 8080,
-                "debug": False
-            }
-        }
+        return deepcopy(_DEFAULT_CONFIG)
     
     def save_config(self):
         """Save configuration to file"""
@@ -99,9 +123,17 @@ class ConfigManager:
             # Ensure directory exists
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Save configuration
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Serialize once and write the bytes in a single call
+            if orjson is not None:
+                payload = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(self.config, indent=2).encode('utf-8')
+
+            # Write to a temp file then rename atomically, so a crash
+            # mid-save can't leave a corrupt config behind
+            tmp_path = self.config_path.with_suffix('.tmp')
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.config_path)
             
             logger.info(f"Configuration saved to {self.config_path}")
             return True
@@ -120,13 +152,25 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
+        try:
+            return self._get_cache[keys]
+        except (KeyError, TypeError):
+            # TypeError: unhashable key arguments can't be cached, but
+            # must still fall through to the plain lookup below
+            pass
+
         try:
             value = self.config
             for key in keys:
                 value = value[key]
-            return value
         except (KeyError, TypeError):
             return default
+
+        try:
+            self._get_cache[keys] = value
+        except TypeError:
+            pass
+        return value
     
     def get_section(self, section, default=None):
         """Get an entire configuration section
@@ -148,6 +192,7 @@ class ConfigManager:
             data: New section data
         """
         self.config[section] = data
+        self._get_cache.clear()
     
     def set(self, *keys, value):
         """Set configuration value
@@ -162,14 +207,16 @@ class ConfigManager:
                 config[key] = {}
             config = config[key]
         config[keys[-1]] = value
+        self._get_cache.clear()
     
     def get_all_config(self):
         """Get entire configuration
-        
+
         Returns:
-            Complete configuration dictionary
+            Read-only view of the complete configuration. Callers that
+            need to mutate it should make their own copy with dict().
         """
-        return self.config.copy()
+        return MappingProxyType(self.config)
     
     def reload_config(self):
         """Reload configuration from file"""
@@ -230,6 +277,7 @@ class ConfigManager:
             self.config['plugins']['settings'] = {}
         
         self.config['plugins']['settings'][plugin_name] = config
+        self._get_cache.clear()
     
     def add_api_key(self, service_name, api_key):
         """Add or update an API key
@@ -242,6 +290,7 @@ class ConfigManager:
             self.config['api_keys'] = {}
         
         self.config['api_keys'][service_name] = api_key
+        self._get_cache.clear()
     
     def get_api_key(self, service_name):
         """Get API key for service
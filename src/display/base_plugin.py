@@ -2,24 +2,78 @@
 """
 Base Plugin Class for eInk InfoDisplay
 """
-from abc import ABC, abstractmethod
 import logging
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
 
 logger = logging.getLogger(__name__)
 
-class BasePlugin(ABC):
-    """Base class for all display plugins"""
-    
+# Measured text widths keyed on (font id, text). Measuring goes through
+# FreeType rasterization, so repeated strings (clock digits, table labels)
+# are pure repeat work worth caching. Bounded to keep memory flat.
+_text_width_cache = {}
+_TEXT_WIDTH_CACHE_MAX = 512
+
+# Display format strings hoisted to module level; keyed dispatch replaces
+# the per-call branch ladder in format_timestamp/format_date
+_TIME_FORMATS = {
+    (True, True): "%H:%M:%S",
+    (True, False): "%H:%M",
+    (False, True): "%I:%M:%S %p",
+    (False, False): "%I:%M %p",
+}
+
+_DATE_FORMATS = {
+    'full': "%A, %B %d, %Y",
+    'short': "%m/%d/%Y",
+    'day': "%A",
+}
+
+# Y coordinate of the header rule for the default header size (32);
+# it is baked into the cached chrome image built by _build_chrome
+_HEADER_RULE_Y = 20 + 32 + 10
+
+def _measure_text_width(draw, text, font):
+    """Measure rendered text width, caching per (font, text) pair"""
+    key = (id(font), text)
+    width = _text_width_cache.get(key)
+    if width is None:
+        try:
+            bbox = draw.textbbox((0, 0), text, font=font)
+            width = bbox[2] - bbox[0]
+        except (AttributeError, TypeError):
+            width = draw.textsize(text, font=font)[0]
+        if len(_text_width_cache) >= _TEXT_WIDTH_CACHE_MAX:
+            _text_width_cache.clear()
+        _text_width_cache[key] = width
+    return width
+
+class BasePlugin:
+    """Base class for all display plugins
+
+    Plugins must override render(). A plain class with __slots__ is used
+    instead of an ABC to avoid metaclass overhead on instantiation and
+    keep attribute access on slot descriptors. Subclasses may declare
+    their own __slots__ for the same benefit.
+    """
+
+    __slots__ = ('config', 'display', 'plugin_config', 'name', 'description',
+                 'update_interval', 'width', 'height', 'colors', 'colors_ns',
+                 '_color_cache', '_font_cache', '_chrome',
+                 '_glyph_atlases')
+
     def __init__(self, config_manager, display_manager, plugin_config=None):
         """Initialize the plugin
-        
+
         Args:
             config_manager: ConfigManager instance
-            display_manager: EInkDisplayManager instance  
+            display_manager: EInkDisplayManager instance
             plugin_config: Plugin-specific configuration
         """
+        if type(self).render is BasePlugin.render:
+            raise NotImplementedError(
+                f"{type(self).__name__} must override render()")
+
         self.config = config_manager
         self.display = display_manager
         self.plugin_config = plugin_config or {}
@@ -32,37 +86,49 @@ class BasePlugin(ABC):
         # Display properties
         self.width, self.height = self.display.get_dimensions()
         self.colors = self.display.colors
+        self.colors_ns = getattr(self.display, 'colors_ns', None)
+
+        # Flat name -> RGB mapping resolved once, so the per-draw color
+        # lookup is a single dict hit instead of isinstance + get
+        self._color_cache = dict(self.colors)
         
-        # Load fonts
-        self.fonts = self._load_fonts()
-        
+        # Fonts resolved by get_font, keyed on (name, size)
+        self._font_cache = {}
+
+        # Cached frame with the static decorations pre-drawn (built lazily)
+        self._chrome = None
+
+        # Pre-rendered glyph tiles keyed on (font, color), built on first
+        # use by paste_text
+        self._glyph_atlases = {}
+
         # Plugin initialization
         self.setup()
     
-    def _load_fonts(self):
-        """Load fonts for the plugin
-        
-        Returns:
-            Dictionary of fonts
-        """
-        try:
-            return self.display.get_fonts()
-        except Exception as e:
-            logger.error(f"Error loading fonts: {e}")
-            return {"default_24": ImageFont.load_default()}
-    
     def setup(self):
         """Plugin-specific setup (override in subclasses)"""
         pass
+
+    def _resolve_color(self, color):
+        """Resolve a color name to its RGB value
+
+        Args:
+            color: Color name string or RGB tuple
+
+        Returns:
+            RGB tuple (or the value unchanged if not a known name)
+        """
+        if color.__class__ is str:
+            return self._color_cache.get(color, color)
+        return color
     
-    @abstractmethod
     def render(self):
-        """Render the plugin content to the display
-        
+        """Render the plugin content to the display (override in subclasses)
+
         Returns:
             True if successful, False otherwise
         """
-        pass
+        raise NotImplementedError
     
     def create_image(self, background_color='white'):
         """Create a new image for the plugin
@@ -73,8 +139,130 @@ class BasePlugin(ABC):
         Returns:
             PIL Image object
         """
+        if background_color == 'white':
+            # Copy the cached chrome frame (a C-level memcpy) instead of
+            # redrawing the static decorations every render
+            if self._chrome is None:
+                self._chrome = self._build_chrome()
+            return self._chrome.copy()
         return self.display.create_image(background_color)
-    
+
+    def _build_chrome(self):
+        """Build the baseline frame with static decorations pre-drawn
+
+        Returns:
+            PIL Image object with the header rule already rendered
+        """
+        image = self.display.create_image('white')
+        draw = self.display.create_draw(image)
+        draw.line([(50, _HEADER_RULE_Y), (self.width - 50, _HEADER_RULE_Y)],
+                  fill=self.colors['black'], width=2)
+        return image
+
+    def _render_glyph(self, char, font, color_value):
+        """Render a single character to a reusable tile
+
+        Args:
+            char: Single character to render
+            font: PIL Font object
+            color_value: RGB color tuple
+
+        Returns:
+            PIL Image tile containing the rendered character
+        """
+        dummy = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+        bbox = dummy.textbbox((0, 0), char, font=font)
+        width = max(bbox[2], 1)
+        height = max(bbox[3], 1)
+        tile = Image.new('RGB', (width, height), self.colors['white'])
+        ImageDraw.Draw(tile).text((0, 0), char, font=font, fill=color_value)
+        return tile
+
+    def _render_text_tile(self, text, font, color='black'):
+        """Rasterize a string once into a reusable pasteable tile
+
+        Static labels (column headers, status pills) can be drawn into a
+        tile at init and pasted per render, replacing glyph shaping and
+        compositing with a raw memcpy.
+
+        Args:
+            text: Text to rasterize
+            font: PIL Font object
+            color: Text color
+
+        Returns:
+            PIL Image tile with the text on a white background
+        """
+        color_value = self._resolve_color(color)
+        dummy = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+        bbox = dummy.textbbox((0, 0), text, font=font)
+        tile = Image.new('RGB', (max(bbox[2], 1), max(bbox[3], 1)),
+                         self.colors['white'])
+        ImageDraw.Draw(tile).text((0, 0), text, font=font, fill=color_value)
+        return tile
+
+    def paste_text(self, image, text, x, y, font, color='black'):
+        """Compose text from pre-rendered glyph tiles
+
+        Unlike draw.text, glyphs are rasterized through FreeType only
+        once per (font, color) and then pasted, which keeps repeatedly
+        redrawn strings (like the clock time) off the FreeType hot path.
+
+        Args:
+            image: PIL Image object to paste onto
+            text: Text to compose
+            x: Left X coordinate
+            y: Y coordinate
+            font: PIL Font object
+            color: Text color
+
+        Returns:
+            X coordinate after the last glyph
+        """
+        color_value = self._resolve_color(color)
+        atlas_key = (id(font), color_value)
+        atlas = self._glyph_atlases.get(atlas_key)
+        if atlas is None:
+            atlas = {}
+            self._glyph_atlases[atlas_key] = atlas
+
+        for char in text:
+            tile = atlas.get(char)
+            if tile is None:
+                tile = self._render_glyph(char, font, color_value)
+                atlas[char] = tile
+            image.paste(tile, (x, y))
+            x += tile.width
+        return x
+
+    def paste_text_centered(self, image, text, y_position, font, color='black'):
+        """Compose text from glyph tiles, centered horizontally
+
+        Args:
+            image: PIL Image object to paste onto
+            text: Text to compose
+            y_position: Y coordinate
+            font: PIL Font object
+            color: Text color
+        """
+        color_value = self._resolve_color(color)
+        atlas_key = (id(font), color_value)
+        atlas = self._glyph_atlases.get(atlas_key)
+        if atlas is None:
+            atlas = {}
+            self._glyph_atlases[atlas_key] = atlas
+
+        total_width = 0
+        for char in text:
+            tile = atlas.get(char)
+            if tile is None:
+                tile = self._render_glyph(char, font, color_value)
+                atlas[char] = tile
+            total_width += tile.width
+
+        x_position = (self.width - total_width) // 2
+        return self.paste_text(image, text, x_position, y_position, font, color)
+
     def create_draw(self, image):
         """Create a drawing context for the image
         
@@ -104,9 +292,54 @@ class BasePlugin(ABC):
         Returns:
             PIL Font object
         """
-        font_key = f"{font_name}_{size}"
-        return self.fonts.get(font_key, self.fonts.get(f"default_{size}", ImageFont.load_default()))
+        key = (font_name, size)
+        font = self._font_cache.get(key)
+        if font is None:
+            # Fonts are loaded lazily by the display manager; the local
+            # cache keeps repeat lookups to a single dict hit
+            try:
+                font = self.display.get_font(font_name, size)
+            except Exception as e:
+                logger.error(f"Error loading font {font_name} {size}: {e}")
+                font = ImageFont.load_default()
+            self._font_cache[key] = font
+        return font
     
+    def draw_batch(self, draw, ops):
+        """Flush a list of draw operations in one tight pass
+
+        Collecting operations and replaying them here keeps font and
+        color resolution out of the render body: each distinct font key
+        is resolved once per batch instead of once per call.
+
+        Args:
+            draw: PIL ImageDraw object
+            ops: List of (kind, args, font_key, color) tuples where kind
+                is 'text', 'text_centered', 'line' or 'rectangle',
+                font_key is a (name, size) tuple or None, and args are
+                (xy, text) for 'text', (text, y) for 'text_centered',
+                and (xy, width) for 'line' and 'rectangle'
+        """
+        fonts = {}
+        resolve = self._resolve_color
+        for kind, args, font_key, color in ops:
+            font = None
+            if font_key is not None:
+                font = fonts.get(font_key)
+                if font is None:
+                    font = self.get_font(*font_key)
+                    fonts[font_key] = font
+
+            fill = resolve(color)
+            if kind == 'text':
+                draw.text(args[0], args[1], font=font, fill=fill)
+            elif kind == 'text_centered':
+                self.draw_text_centered(draw, args[0], args[1], font, fill)
+            elif kind == 'line':
+                draw.line(args[0], fill=fill, width=args[1])
+            elif kind == 'rectangle':
+                draw.rectangle(args[0], outline=fill, width=args[1])
+
     def draw_text_centered(self, draw, text, y_position, font=None, color='black'):
         """Draw text centered horizontally
         
@@ -120,15 +353,10 @@ class BasePlugin(ABC):
         if font is None:
             font = self.get_font()
         
-        # Get text dimensions
-        try:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-        except (AttributeError, TypeError):
-            text_width = draw.textsize(text, font=font)[0]
+        text_width = _measure_text_width(draw, text, font)
         
         x_position = (self.width - text_width) // 2
-        color_value = self.colors.get(color, color) if isinstance(color, str) else color
+        color_value = self._resolve_color(color)
         
         draw.text((x_position, y_position), text, font=font, fill=color_value)
         
@@ -148,15 +376,10 @@ class BasePlugin(ABC):
         if font is None:
             font = self.get_font()
         
-        # Get text dimensions
-        try:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-        except (AttributeError, TypeError):
-            text_width = draw.textsize(text, font=font)[0]
+        text_width = _measure_text_width(draw, text, font)
         
         x_position = x_right - text_width
-        color_value = self.colors.get(color, color) if isinstance(color, str) else color
+        color_value = self._resolve_color(color)
         
         draw.text((x_position, y_position), text, font=font, fill=color_value)
         
@@ -173,10 +396,12 @@ class BasePlugin(ABC):
         header_font = self.get_font("bold", font_size)
         self.draw_text_centered(draw, title, 20, header_font, 'black')
         
-        # Draw a line under the header
+        # Draw a line under the header (already part of the cached chrome
+        # for the default header size)
         line_y = 20 + font_size + 10
-        draw.line([(50, line_y), (self.width - 50, line_y)], fill=self.colors['black'], width=2)
-        
+        if line_y != _HEADER_RULE_Y:
+            draw.line([(50, line_y), (self.width - 50, line_y)], fill=self.colors['black'], width=2)
+
         return line_y + 20  # Return Y position after header
     
     def draw_footer(self, draw, text, font_size=16):
@@ -207,17 +432,8 @@ class BasePlugin(ABC):
             dt = datetime.now()
         
         format_24h = self.plugin_config.get('format_24h', True)
-        
-        if format_24h:
-            if include_seconds:
-                return dt.strftime("%H:%M:%S")
-            else:
-                return dt.strftime("%H:%M")
-        else:
-            if include_seconds:
-                return dt.strftime("%I:%M:%S %p")
-            else:
-                return dt.strftime("%I:%M %p")
+
+        return dt.strftime(_TIME_FORMATS[(bool(format_24h), bool(include_seconds))])
     
     def format_date(self, dt=None, format_style='full'):
         """Format a date for display
@@ -232,14 +448,11 @@ class BasePlugin(ABC):
         if dt is None:
             dt = datetime.now()
         
-        if format_style == 'full':
-            return dt.strftime("%A, %B %d, %Y")
-        elif format_style == 'short':
-            return dt.strftime("%m/%d/%Y")
-        elif format_style == 'day':
-            return dt.strftime("%A")
-        else:
-            return dt.strftime("%Y-%m-%d")
+        fmt = _DATE_FORMATS.get(format_style)
+        if fmt is None:
+            # ISO date via the C fast path, bypassing strftime entirely
+            return dt.date().isoformat()
+        return dt.strftime(fmt)
     
     def cleanup(self):
         """Clean up plugin resources (override in subclasses if needed)"""
@@ -14,40 +14,50 @@ class ClockPlugin(BasePlugin):
         self.name = "clock"
         self.description = "Digital clock with date"
         self.update_interval = 60  # Update every minute
-        
+
+        # Key of the last rendered frame (the displayed strings) so
+        # no-op ticks skip both the draw and the slow eInk refresh
+        self._last_frame_key = None
+
     def render(self):
         """Render the clock display"""
         try:
+            # Get current time and the strings that make up the frame
+            now = datetime.now()
+            time_str = self.format_timestamp(now, self.get_config_value('show_seconds', False))
+            date_str = self.format_date(now, 'full')
+            day_str = now.strftime("%A")
+            timezone_str = now.strftime("%Z %z")
+
+            frame_key = (time_str, date_str, day_str, timezone_str)
+            if frame_key == self._last_frame_key:
+                self.log_info("Clock unchanged - skipping redraw")
+                return True
+
             # Create image
             image = self.create_image('white')
             draw = self.create_draw(image)
-            
-            # Get current time
-            now = datetime.now()
-            
+
             # Draw header
             header_y = self.draw_header(draw, "Clock")
-            
             # Draw time (large)
-            time_str = self.format_timestamp(now, self.get_config_value('show_seconds', False))
             time_font = self.get_font("bold", 96)
             time_y = header_y + 50
-            self.draw_text_centered(draw, time_str, time_y, time_font, 'black')
-            
+            # Compose the big time string from cached glyph tiles so the
+            # per-minute redraw skips FreeType entirely
+            self.paste_text_centered(image, time_str, time_y, time_font, 'black')
+
             # Draw date
-            date_str = self.format_date(now, 'full')
             date_font = self.get_font("regular", 32)
             date_y = time_y + 120
             self.draw_text_centered(draw, date_str, date_y, date_font, 'blue')
-            
+
             # Draw day of week if not already in date
-            day_str = now.strftime("%A")
             day_font = self.get_font("bold", 24)
             day_y = date_y + 50
             self.draw_text_centered(draw, day_str, day_y, day_font, 'green')
-            
+
             # Draw timezone info
-            timezone_str = now.strftime("%Z %z")
             if timezone_str.strip():
                 self.draw_footer(draw, f"Timezone: {timezone_str}")
             else:
@@ -55,10 +65,14 @@ class ClockPlugin(BasePlugin):
             
             # Show the image
             self.show_image(image)
+            self._last_frame_key = frame_key
             self.log_info(f"Clock updated: {time_str}")
-            
+
             return True
             
         except Exception as e:
             self.log_error(f"Failed to render clock: {e}")
-            return False
\ No newline at end of file
+            return False
+
+# Explicit registry entry used by PluginManager._load_plugin
+PLUGIN_CLASS = ClockPlugin
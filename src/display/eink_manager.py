@@ -2,13 +2,125 @@
 """
 eInk Display Manager for Pimoroni Inky Impression 7.3"
 """
+import functools
+import hashlib
 import logging
+import os
+import queue
+import threading
 import time
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
+from types import SimpleNamespace
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+# Cached Inky device handle. Probing the panel over SPI/I2C in auto()
+# takes noticeable time on a Pi, so managers created after the first
+# (tests, web app restarts) reuse the same device instead of re-probing.
+_INKY_DEVICE = None
+_inky_lock = threading.Lock()
+
+def _get_inky():
+    """Auto-detect the Inky display once and reuse the handle
+
+    Returns:
+        The shared Inky device instance
+
+    Raises:
+        ImportError: If the inky library is not installed
+    """
+    global _INKY_DEVICE
+    with _inky_lock:
+        if _INKY_DEVICE is None:
+            from inky.auto import auto
+            _INKY_DEVICE = auto()
+        return _INKY_DEVICE
+
+def _dither_fs(arr, palette):
+    """Floyd-Steinberg error diffusion onto the panel palette
+
+    Written with explicit scalar loops for numba to compile; only ever
+    invoked compiled - the interpreted version takes minutes per frame,
+    so dithering is disabled when numba is unavailable.
+
+    Args:
+        arr: int32 HxWx3 pixel array (modified in place; int32 keeps the
+            squared-distance terms from wrapping)
+        palette: int32 Nx3 palette matrix
+
+    Returns:
+        numpy uint8 HxW array of palette indices
+    """
+    height, width = arr.shape[0], arr.shape[1]
+    n_colors = palette.shape[0]
+    indices = np.empty((height, width), dtype=np.uint8)
+
+    for y in range(height):
+        for x in range(width):
+            r, g, b = arr[y, x, 0], arr[y, x, 1], arr[y, x, 2]
+
+            best = 0
+            best_dist = 1 << 30
+            for p in range(n_colors):
+                dr = r - palette[p, 0]
+                dg = g - palette[p, 1]
+                db = b - palette[p, 2]
+                dist = dr * dr + dg * dg + db * db
+                if dist < best_dist:
+                    best_dist = dist
+                    best = p
+            indices[y, x] = best
+
+            err_r = r - palette[best, 0]
+            err_g = g - palette[best, 1]
+            err_b = b - palette[best, 2]
+
+            if x + 1 < width:
+                arr[y, x + 1, 0] += err_r * 7 // 16
+                arr[y, x + 1, 1] += err_g * 7 // 16
+                arr[y, x + 1, 2] += err_b * 7 // 16
+            if y + 1 < height:
+                if x > 0:
+                    arr[y + 1, x - 1, 0] += err_r * 3 // 16
+                    arr[y + 1, x - 1, 1] += err_g * 3 // 16
+                    arr[y + 1, x - 1, 2] += err_b * 3 // 16
+                arr[y + 1, x, 0] += err_r * 5 // 16
+                arr[y + 1, x, 1] += err_g * 5 // 16
+                arr[y + 1, x, 2] += err_b * 5 // 16
+                if x + 1 < width:
+                    arr[y + 1, x + 1, 0] += err_r // 16
+                    arr[y + 1, x + 1, 1] += err_g // 16
+                    arr[y + 1, x + 1, 2] += err_b // 16
+
+    return indices
+
+if njit is not None:
+    _dither_fs = njit(cache=True)(_dither_fs)
+
+# Palette constants with attribute access; plugins can bind these once
+# instead of paying a dict lookup per draw call
+COLORS = SimpleNamespace(
+    black=(0, 0, 0),
+    white=(255, 255, 255),
+    red=(255, 0, 0),
+    orange=(255, 165, 0),
+    yellow=(255, 255, 0),
+    green=(0, 255, 0),
+    blue=(0, 0, 255),
+    clean=(255, 255, 255)  # Clean/clear color
+)
+
 class EInkDisplayManager:
     """Manages the eInk display hardware"""
     
@@ -31,26 +143,40 @@ class EInkDisplayManager:
         self.height = display_config.get("height", 480)
         self.color_mode = display_config.get("color", "7color")
         self.rotation = display_config.get("rotation", 0)
+
+        # Resample filter for the rare mismatched-size path; BICUBIC is
+        # noticeably cheaper than LANCZOS on the Pi and plugins normally
+        # render at the native resolution anyway
+        # Optional Floyd-Steinberg dithering for photographic content;
+        # text-heavy frames look crisper without it. Only honored with
+        # numba: the uncompiled scalar loop takes minutes per 800x480
+        # frame on a Pi, which would effectively hang the daemon
+        self.dither = display_config.get("dither", False)
+        if self.dither and njit is None:
+            logger.warning(
+                "display.dither requires numba - disabling dithering")
+            self.dither = False
+
+        filter_name = display_config.get("resample_filter", "bicubic")
+        self._resample_filter = {
+            "bicubic": Image.BICUBIC,
+            "bilinear": Image.BILINEAR,
+            "lanczos": Image.LANCZOS
+        }.get(filter_name, Image.BICUBIC)
+        self._warned_resize = False
         
         # Initialize display
         self._initialize_display()
         
-        # Color palette for 7-color display
-        self.colors = {
-            'black': (0, 0, 0),
-            'white': (255, 255, 255),
-            'red': (255, 0, 0),
-            'orange': (255, 165, 0),
-            'yellow': (255, 255, 0),
-            'green': (0, 255, 0),
-            'blue': (0, 0, 255),
-            'clean': (255, 255, 255)  # Clean/clear color
-        }
+        # Color palette for 7-color display (same tuples as COLORS; the
+        # dict form is kept for name-based lookups)
+        self.colors = vars(COLORS).copy()
+        self.colors_ns = COLORS
         
         # Inky palette mapping
         self.inky_palette = [
             0,   # Black
-            1,   # White  
+            1,   # White
             2,   # Green
             3,   # Blue
             4,   # Red
@@ -58,14 +184,55 @@ class EInkDisplayManager:
             6,   # Orange
             7    # Clean
         ]
-        
+
+        # Palette matrix in panel index order, used by the vectorized
+        # quantizer (index 7 is the clean color, same RGB as white).
+        # int32: squared channel distances reach ~195k, past int16's max
+        if np is not None:
+            self._palette_arr = np.array(
+                [self.colors[c] for c in ('black', 'white', 'green', 'blue',
+                                          'red', 'yellow', 'orange', 'clean')],
+                dtype=np.int32)
+        else:
+            self._palette_arr = None
+
+        # 12-bit RGB -> palette index lookup table, built on first use
+        self._lut = None
+
+        # Hash of the last flushed frame; identical frames skip the ~30s
+        # panel refresh entirely. Persisted so a restart doesn't force a
+        # refresh of content that is already on the panel.
+        self._hash_path = "/var/tmp/einkocube_frame.hash"
+        self._last_hash = None
+        try:
+            with open(self._hash_path, 'rb') as f:
+                self._last_hash = f.read()
+        except OSError:
+            pass
+
+        # Font file paths; faces are loaded lazily per (name, size) so
+        # only the sizes plugins actually request hit FreeType
+        self._font_paths = {
+            "bold": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+            "regular": "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "mono": "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf"
+        }
+
+        # Background worker that flushes frames to the panel. The ~30s
+        # eInk refresh no longer blocks the caller; a one-slot queue
+        # coalesces to the newest frame if renders outpace the panel.
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._refresh_thread = None
+        if self.display is not None:
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="eink-refresh", daemon=True)
+            self._refresh_thread.start()
+
     def _initialize_display(self):
         """Initialize the Inky display"""
         try:
-            from inky.auto import auto
-            
-            # Auto-detect the display
-            self.display = auto()
+            # Auto-detect the display (cached at module scope)
+            self.display = _get_inky()
             logger.info(f"Detected display: {type(self.display).__name__}")
             logger.info(f"Display resolution: {self.display.width}x{self.display.height}")
             
@@ -126,25 +293,127 @@ class EInkDisplayManager:
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             
-            # Resize if necessary
+            # Resize if necessary (warn once - the fix belongs in the plugin)
             if image.size != (self.width, self.height):
-                logger.info(f"Resizing image from {image.size} to {self.width}x{self.height}")
-                image = image.resize((self.width, self.height), Image.LANCZOS)
-            
-            # Set the image on the display
-            logger.info("Updating eInk display...")
-            start_time = time.time()
-            
-            self.display.set_image(image)
-            self.display.show()
-            
-            end_time = time.time()
-            logger.info(f"Display update completed in {end_time - start_time:.1f} seconds")
+                if not self._warned_resize:
+                    logger.warning(
+                        f"Resizing image from {image.size} to "
+                        f"{self.width}x{self.height} - plugins should render "
+                        f"at the native resolution")
+                    self._warned_resize = True
+                image = image.resize((self.width, self.height), self._resample_filter)
             
+            # Pre-quantize to the panel palette so the driver skips its
+            # per-pixel RGB mapping
+            if self._palette_arr is not None:
+                image = self._quantize(image)
+            else:
+                # Without numpy the queued frame would be the caller's
+                # own object, which plugins mutate in place on their
+                # next render while the refresh thread may still be
+                # flushing it - copy to decouple them
+                image = image.copy()
+
+            # Hashing the frame costs ~1ms; a redundant panel refresh
+            # costs ~30s, so identical frames are dropped here
+            frame_hash = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+            if frame_hash == self._last_hash:
+                logger.info("Display unchanged - skipping refresh")
+                return
+            self._last_hash = frame_hash
+
+            # Hand the frame to the refresh worker; if a stale frame is
+            # still pending, replace it with the newest one
+            logger.info("Queueing eInk display update...")
+            try:
+                self._frame_queue.put_nowait(image)
+            except queue.Full:
+                try:
+                    self._frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._frame_queue.put_nowait(image)
+
         except Exception as e:
             logger.error(f"Failed to show image: {e}")
             raise
+
+    def _refresh_loop(self):
+        """Flush queued frames to the panel (runs in a daemon thread)"""
+        while True:
+            image = self._frame_queue.get()
+            if image is None:
+                break
+
+            try:
+                logger.info("Updating eInk display...")
+                start_time = time.time()
+
+                self.display.set_image(image)
+                self.display.show()
+
+                end_time = time.time()
+                logger.info(f"Display update completed in {end_time - start_time:.1f} seconds")
+
+                # Persist the hash of the frame that actually reached the
+                # panel (a newer frame may already be queued)
+                try:
+                    flushed = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+                    tmp_path = self._hash_path + '.tmp'
+                    with open(tmp_path, 'wb') as f:
+                        f.write(flushed)
+                    os.replace(tmp_path, self._hash_path)
+                except OSError as e:
+                    logger.warning(f"Could not persist frame hash: {e}")
+            except Exception as e:
+                logger.error(f"Failed to show image: {e}")
     
+    def _build_lut(self):
+        """Build the 12-bit RGB -> palette index lookup table
+
+        4 bits per channel is lossless for a 7-color panel; the 4096-entry
+        table is filled with a single nearest-color argmin at build time.
+
+        Returns:
+            numpy uint8 array of 4096 palette indices
+        """
+        grid = np.arange(4096, dtype=np.uint16)
+        rgb = np.stack([(grid >> 8) & 0xF, (grid >> 4) & 0xF, grid & 0xF],
+                       axis=-1).astype(np.int32) * 17  # expand back to 0-255
+        dist = ((rgb[:, None, :] - self._palette_arr) ** 2).sum(-1)
+        return dist.argmin(-1).astype(np.uint8)
+
+    def _quantize(self, image):
+        """Quantize an RGB frame to the 7-color panel palette
+
+        A single LUT indexing pass replaces the per-pixel nearest-color
+        computation: pixels are reduced to 4 bits per channel and looked
+        up in the precomputed 4096-entry table.
+
+        Args:
+            image: PIL RGB Image object
+
+        Returns:
+            P-mode PIL Image with palette indices in panel order
+        """
+        if self.dither:
+            indices = _dither_fs(np.asarray(image).astype(np.int32),
+                                 self._palette_arr)
+        else:
+            if self._lut is None:
+                self._lut = self._build_lut()
+
+            arr = np.asarray(image)
+            key = ((arr[..., 0].astype(np.uint16) >> 4) << 8) | \
+                  ((arr[..., 1].astype(np.uint16) >> 4) << 4) | \
+                  (arr[..., 2].astype(np.uint16) >> 4)
+            indices = self._lut[key]
+
+        quantized = Image.fromarray(indices, 'P')
+        palette = self._palette_arr.astype(np.uint8).flatten().tolist()
+        quantized.putpalette(palette + [0] * (768 - len(palette)))
+        return quantized
+
     def clear(self, color='white'):
         """Clear the display
         
@@ -215,39 +484,39 @@ class EInkDisplayManager:
         """
         return (self.width, self.height)
     
-    def get_fonts(self):
-        """Get available fonts
-        
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_font(font_path, size):
+        """Load a TTF font, cached process-wide per (path, size)
+
+        Failures fall back to the default bitmap font; the fallback is
+        cached too so a missing file is only probed (and logged) once.
+        """
+        try:
+            return ImageFont.truetype(font_path, size)
+        except Exception as e:
+            logger.warning(f"Could not load font {font_path}: {e}")
+            return ImageFont.load_default()
+
+    def get_font(self, font_name="regular", size=24):
+        """Get a font, loading it on first request
+
+        Args:
+            font_name: Font style name ('regular', 'bold' or 'mono')
+            size: Font size
+
         Returns:
-            Dictionary of font names and font objects
+            PIL Font object (default font if the face is unavailable)
         """
-        fonts = {}
-        
-        font_paths = [
-            ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "bold"),
-            ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "regular"),
-            ("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", "mono")
-        ]
-        
-        sizes = [16, 20, 24, 32, 48, 64]
-        
-        for font_path, font_name in font_paths:
-            try:
-                for size in sizes:
-                    key = f"{font_name}_{size}"
-                    fonts[key] = ImageFont.truetype(font_path, size)
-            except Exception as e:
-                logger.warning(f"Could not load font {font_path}: {e}")
-        
-        # Always provide defaults
-        if not fonts:
-            for size in sizes:
-                fonts[f"default_{size}"] = ImageFont.load_default()
-        
-        return fonts
+        font_path = self._font_paths.get(font_name)
+        if font_path is None:
+            return ImageFont.load_default()
+        return self._load_font(font_path, size)
     
     def cleanup(self):
         """Clean up display resources"""
         logger.info("Cleaning up display manager...")
-        # eInk displays don't need special cleanup, but we can clear if desired
-        pass
\ No newline at end of file
+        # Let the refresh worker finish the frame in flight, then stop it
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            self._frame_queue.put(None)
+            self._refresh_thread.join(timeout=60)
\ No newline at end of file
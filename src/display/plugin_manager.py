@@ -5,7 +5,9 @@ Plugin Manager for eInk InfoDisplay
 import os
 import sys
 import importlib
+import importlib.util
 import logging
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -23,10 +25,25 @@ class PluginManager:
         """
         self.config = config_manager
         self.display = display_manager
+
+        # Cached views of the plugins section; walking the nested config
+        # repeats dict lookups on every plugin operation otherwise
+        self._plugins_cfg = self.config.get_section("plugins")
+        self._plugin_settings = self._plugins_cfg.get("settings", {})
+
         self.plugins = {}
         self.current_plugin = None
+        # Monotonic timestamps drive the update checks (immune to
+        # wall-clock jumps); wall-clock times are kept only for status
         self.last_update_times = {}
-        
+        self._last_update_wall = {}
+
+        # Stable cycle order plus a name -> position map so cycling is
+        # O(1) instead of a list scan per button press
+        self._plugin_order = []
+        self._plugin_index = {}
+        self._current_index = -1
+
         # Load plugins
         self._load_plugins()
         
@@ -42,7 +59,7 @@ class PluginManager:
         sys.path.insert(0, str(plugins_dir.parent))
         
         # Get enabled plugins from config
-        enabled_plugins = self.config.get("plugins", {}).get("enabled", [])
+        enabled_plugins = self._plugins_cfg.get("enabled", [])
         logger.info(f"Loading enabled plugins: {enabled_plugins}")
         
         # Load each enabled plugin
@@ -52,6 +69,9 @@ class PluginManager:
             except Exception as e:
                 logger.error(f"Failed to load plugin {plugin_name}: {e}")
         
+        self._plugin_order = list(self.plugins.keys())
+        self._plugin_index = {name: i for i, name in enumerate(self._plugin_order)}
+
         logger.info(f"Loaded {len(self.plugins)} plugins")
     
     def _load_plugin(self, plugin_name):
@@ -61,26 +81,32 @@ class PluginManager:
             plugin_name: Name of the plugin to load
         """
         try:
-            # Import the plugin module
+            # Check the module exists before paying the ImportError cost
             module_name = f"plugins.{plugin_name}_plugin"
+            if importlib.util.find_spec(module_name) is None:
+                logger.error(f"Plugin module not found: {module_name}")
+                return
+
             plugin_module = importlib.import_module(module_name)
-            
-            # Find the plugin class
-            plugin_class = None
-            for attr_name in dir(plugin_module):
-                attr = getattr(plugin_module, attr_name)
-                if (isinstance(attr, type) and 
-                    hasattr(attr, 'render') and 
-                    attr.__name__.lower().endswith('plugin')):
-                    plugin_class = attr
-                    break
-            
+
+            # Prefer the explicit PLUGIN_CLASS registry entry; fall back
+            # to scanning module attributes for older plugins
+            plugin_class = getattr(plugin_module, 'PLUGIN_CLASS', None)
+            if plugin_class is None:
+                for attr_name in dir(plugin_module):
+                    attr = getattr(plugin_module, attr_name)
+                    if (isinstance(attr, type) and
+                        hasattr(attr, 'render') and
+                        attr.__name__.lower().endswith('plugin')):
+                        plugin_class = attr
+                        break
+
             if not plugin_class:
                 logger.error(f"No plugin class found in {module_name}")
                 return
             
             # Get plugin configuration
-            plugin_config = self.config.get("plugins", {}).get("settings", {}).get(plugin_name, {})
+            plugin_config = self._plugin_settings.get(plugin_name, {})
             
             # Create plugin instance
             plugin_instance = plugin_class(self.config, self.display, plugin_config)
@@ -141,7 +167,8 @@ class PluginManager:
             
             if success:
                 self.current_plugin = plugin_name
-                self.last_update_times[plugin_name] = datetime.now()
+                self.last_update_times[plugin_name] = time.monotonic()
+                self._last_update_wall[plugin_name] = datetime.now()
                 logger.info(f"Plugin {plugin_name} completed successfully")
             else:
                 logger.error(f"Plugin {plugin_name} failed to render")
@@ -169,11 +196,8 @@ class PluginManager:
         # Get plugin update interval
         update_interval = getattr(plugin, 'update_interval', 300)  # Default 5 minutes
         
-        # Check if enough time has passed
-        last_update = self.last_update_times[plugin_name]
-        time_since_update = (datetime.now() - last_update).total_seconds()
-        
-        return time_since_update >= update_interval
+        # Check if enough time has passed (single float subtraction)
+        return time.monotonic() - self.last_update_times[plugin_name] >= update_interval
     
     def update_display(self):
         """Update the display with the current or default plugin
@@ -186,7 +210,7 @@ class PluginManager:
             plugin_name = self.current_plugin
         else:
             # Use default plugin
-            default_plugin = self.config.get("plugins", {}).get("default", "clock")
+            default_plugin = self._plugins_cfg.get("default", "clock")
             plugin_name = default_plugin if default_plugin in self.plugins else None
             
             if not plugin_name and self.plugins:
@@ -201,21 +225,17 @@ class PluginManager:
     
     def cycle_plugins(self):
         """Cycle through all available plugins"""
-        plugin_names = list(self.plugins.keys())
-        
-        if not plugin_names:
+        if not self._plugin_order:
             logger.error("No plugins available for cycling")
             return False
-        
-        # Find current plugin index
-        current_index = -1
-        if self.current_plugin in plugin_names:
-            current_index = plugin_names.index(self.current_plugin)
-        
-        # Move to next plugin
-        next_index = (current_index + 1) % len(plugin_names)
-        next_plugin = plugin_names[next_index]
-        
+
+        # Resync the cursor if the current plugin was switched directly
+        # (e.g. through the web interface)
+        current_index = self._plugin_index.get(self.current_plugin, self._current_index)
+
+        self._current_index = (current_index + 1) % len(self._plugin_order)
+        next_plugin = self._plugin_order[self._current_index]
+
         logger.info(f"Cycling from {self.current_plugin} to {next_plugin}")
         return self.run_plugin(next_plugin, force_update=True)
     
@@ -228,7 +248,7 @@ class PluginManager:
         status = {}
         
         for plugin_name, plugin in self.plugins.items():
-            last_update = self.last_update_times.get(plugin_name)
+            last_update = self._last_update_wall.get(plugin_name)
             update_interval = getattr(plugin, 'update_interval', 300)
             
             needs_update = self._should_update_plugin(plugin_name, plugin)
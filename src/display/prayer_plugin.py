@@ -2,9 +2,13 @@
 """
 Prayer Times Plugin for eInk InfoDisplay
 """
-import requests
+import json
 import logging
+import os
+import requests
 from datetime import datetime
+from pathlib import Path
+from PIL import Image, ImageDraw
 from .base_plugin import BasePlugin
 
 logger = logging.getLogger(__name__)
@@ -21,22 +25,61 @@ class PrayerPlugin(BasePlugin):
         
         # Prayer data cache
         self.prayer_data = None
-        
+
+        # Display-formatted timings, rebuilt only when the raw timings
+        # change (once per day in practice)
+        self._formatted_timings = {}
+        self._formatted_key = None
+
+        # Prayer times as minutes since midnight, for cheap comparisons
+        self._timings_min = {}
+
+        # Reuse one TCP/TLS connection across fetches, and cache the
+        # day's response on disk so re-renders skip the network entirely
+        self.session = requests.Session()
+        self._cache_dir = Path.home() / ".cache" / "einkocube"
+
         # Prayer names in order
         self.prayer_names = [
             ('Fajr', 'Dawn'),
-            ('Dhuhr', 'Noon'), 
+            ('Dhuhr', 'Noon'),
             ('Asr', 'Afternoon'),
             ('Maghrib', 'Sunset'),
             ('Isha', 'Night')
         ]
+
+    def cleanup(self):
+        """Release the pooled HTTP connections"""
+        self.session.close()
     
+    def _cache_path(self, latitude, longitude, method):
+        """Path of the on-disk cache for today's prayer times
+
+        Args:
+            latitude: Location latitude
+            longitude: Location longitude
+            method: Calculation method
+
+        Returns:
+            Path to the cache file (keyed by location, method, and date)
+        """
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        return self._cache_dir / f"prayer_{date_str}_{latitude}_{longitude}_{method}.json"
+
     def _fetch_prayer_data(self):
-        """Fetch prayer times from API"""
+        """Fetch prayer times from API (or today's on-disk cache)"""
         latitude = self.get_config_value('latitude', 38.903481)
         longitude = self.get_config_value('longitude', -77.262817)
         method = self.get_config_value('method', 1)  # 1 = Islamic Society of North America
-        
+
+        # Fast path: today's response is already cached on disk
+        cache_path = self._cache_path(latitude, longitude, method)
+        try:
+            self.prayer_data = json.loads(cache_path.read_bytes())
+            return True
+        except (OSError, ValueError):
+            pass
+
         try:
             url = "http://api.aladhan.com/v1/timings"
             params = {
@@ -45,44 +88,151 @@ class PrayerPlugin(BasePlugin):
                 'method': method,
                 'format': 'json'
             }
-            
-            response = requests.get(url, params=params, timeout=10)
+
+            # Separate connect/read timeouts so a dead network fails fast
+            response = self.session.get(url, params=params, timeout=(5, 10))
             if response.status_code == 200:
                 data = response.json()
                 self.prayer_data = data.get('data', {})
+                self._save_cache(cache_path)
                 self.log_info("Prayer times fetched successfully")
                 return True
             else:
                 self.log_error(f"Prayer API error: {response.status_code}")
-                return False
-                
+
         except Exception as e:
             self.log_error(f"Error fetching prayer data: {e}")
-            return False
+
+        # Fall back to the last-known-good data so a transient network
+        # hiccup doesn't blank the screen
+        if self.prayer_data:
+            self.log_warning("Using last-known prayer data after fetch failure")
+            return True
+        return False
+
+    def _save_cache(self, cache_path):
+        """Persist the current prayer data to disk (atomic rename)"""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            tmp_path.write_bytes(json.dumps(self.prayer_data).encode('utf-8'))
+            os.replace(tmp_path, cache_path)
+
+            # The cache is keyed by date, so drop older days' files here
+            # rather than letting them pile up on the SD card
+            for stale in self._cache_dir.glob("prayer_*.json"):
+                if stale != cache_path:
+                    stale.unlink()
+        except OSError as e:
+            self.log_warning(f"Could not cache prayer data: {e}")
     
-    def _get_next_prayer(self):
+    def _precompute_display(self, timings):
+        """Format prayer times for display (12h clock) once per timings set
+
+        Args:
+            timings: Timings dictionary from the API
+        """
+        key = tuple(sorted(timings.items()))
+        if key == self._formatted_key:
+            return
+
+        formatted = {}
+        for prayer_key, _ in self.prayer_names:
+            prayer_time = timings.get(prayer_key, "N/A")
+            if prayer_time != "N/A":
+                try:
+                    time_obj = datetime.strptime(prayer_time, "%H:%M")
+                    formatted[prayer_key] = time_obj.strftime("%I:%M %p").lstrip('0')
+                except ValueError:
+                    formatted[prayer_key] = prayer_time
+            else:
+                formatted[prayer_key] = "N/A"
+
+        # Minutes since midnight for _get_next_prayer's integer compare
+        minutes = {}
+        for prayer_key, value in timings.items():
+            try:
+                hour, minute = value.split(':', 1)
+                minutes[prayer_key] = int(hour) * 60 + int(minute[:2])
+            except (ValueError, AttributeError):
+                continue
+
+        self._formatted_timings = formatted
+        self._timings_min = minutes
+        self._formatted_key = key
+
+    def _get_next_prayer(self, now=None):
         """Determine the next prayer time
-        
+
+        Args:
+            now: Current datetime (read once per render and passed in)
+
         Returns:
             Tuple of (prayer_name, prayer_time, is_today)
         """
         if not self.prayer_data:
             return None, None, True
-        
-        now = datetime.now()
-        current_time = now.strftime("%H:%M")
-        
+
+        if now is None:
+            now = datetime.now()
+        now_min = now.hour * 60 + now.minute
+
         timings = self.prayer_data.get('timings', {})
-        
-        # Check each prayer time
+        timings_min = self._timings_min
+
+        # Check each prayer time with an integer minutes-since-midnight
+        # compare instead of lexicographic string comparison
         for prayer_key, display_name in self.prayer_names:
-            prayer_time = timings.get(prayer_key, "")
-            if prayer_time and prayer_time > current_time:
-                return display_name, prayer_time, True
+            prayer_min = timings_min.get(prayer_key)
+            if prayer_min is not None and prayer_min > now_min:
+                return display_name, timings.get(prayer_key, ""), True
         
         # If all prayers have passed, next is Fajr tomorrow
         return self.prayer_names[0][1], timings.get('Fajr', ''), False
     
+    def _render_row_masks(self, next_prayer, time_x_offset):
+        """Rasterize the prayer rows into grayscale masks
+
+        The table region is drawn onto L-mode buffers sized to the text
+        area only, cutting draw bandwidth to a third of a full-frame RGB
+        pass; render() tints each mask with its color at composite time.
+
+        Args:
+            next_prayer: Display name of the highlighted prayer
+            time_x_offset: X offset of the time column within the mask
+
+        Returns:
+            Tuple of (black_mask, green_mask); either may be None if no
+            row uses that color
+        """
+        row_height = 35
+        size = (time_x_offset + 200, row_height * len(self.prayer_names))
+
+        # Fonts resolved once outside the row loop
+        row_fonts = {True: self.get_font("bold", 20),
+                     False: self.get_font("regular", 20)}
+
+        masks = {}
+        draws = {}
+        for i, (prayer_key, display_name) in enumerate(self.prayer_names):
+            highlight = display_name == next_prayer
+            mask = masks.get(highlight)
+            if mask is None:
+                mask = Image.new('L', size, 0)
+                masks[highlight] = mask
+                draws[highlight] = ImageDraw.Draw(mask)
+
+            font = row_fonts[highlight]
+            mask_draw = draws[highlight]
+            y_pos = i * row_height
+
+            # Times were formatted once in _precompute_display
+            formatted_time = self._formatted_timings.get(prayer_key, "N/A")
+            mask_draw.text((0, y_pos), display_name, font=font, fill=255)
+            mask_draw.text((time_x_offset, y_pos), formatted_time, font=font, fill=255)
+
+        return masks.get(False), masks.get(True)
+
     def render(self):
         """Render the prayer times display"""
         try:
@@ -103,91 +253,73 @@ class PrayerPlugin(BasePlugin):
             if hijri_date.get('date'):
                 header_text += f" - {hijri_date['date']}"
             header_y = self.draw_header(draw, header_text)
-            
+
+            # Collect the scattered draw calls into one op list and flush
+            # them in a single draw_batch pass below
+            ops = []
+
             # Current date
             date_str = self.format_date(now, 'full')
-            date_font = self.get_font("regular", 24)
             date_y = header_y + 10
-            self.draw_text_centered(draw, date_str, date_y, date_font, 'blue')
-            
+            ops.append(('text_centered', (date_str, date_y), ("regular", 24), 'blue'))
+
             # Prayer times table
             timings = self.prayer_data.get('timings', {})
+            self._precompute_display(timings)
             table_y = date_y + 60
-            
-            # Get next prayer info
-            next_prayer, next_time, is_today = self._get_next_prayer()
-            
-            # Table headers
-            header_font = self.get_font("bold", 22)
-            time_font = self.get_font("regular", 20)
-            
+
+            # Get next prayer info (reuse the timestamp read above)
+            next_prayer, next_time, is_today = self._get_next_prayer(now)
+
             # Column positions
             name_x = 150
             time_x = 450
-            
-            draw.text((name_x, table_y), "Prayer", font=header_font, fill=self.colors['black'])
-            draw.text((time_x, table_y), "Time", font=header_font, fill=self.colors['black'])
-            
-            # Draw line under headers
+
+            # Bind palette constants once for the mask compositing below
+            black = self.colors_ns.black
+            green = self.colors_ns.green
+
+            ops.append(('text', ((name_x, table_y), "Prayer"), ("bold", 22), black))
+            ops.append(('text', ((time_x, table_y), "Time"), ("bold", 22), black))
+
+            # Line under headers
             line_y = table_y + 30
-            draw.line([(100, line_y), (self.width - 100, line_y)], 
-                     fill=self.colors['black'], width=2)
-            
-            # Draw prayer times
+            ops.append(('line', ([(100, line_y), (self.width - 100, line_y)], 2),
+                        None, black))
+
+            # Draw prayer rows via small grayscale buffers (1 byte/pixel
+            # instead of 3), tinted per color when composited
             row_height = 35
-            for i, (prayer_key, display_name) in enumerate(self.prayer_names):
-                y_pos = line_y + 20 + (i * row_height)
-                
-                prayer_time = timings.get(prayer_key, "N/A")
-                
-                # Highlight next prayer
-                text_color = 'green' if display_name == next_prayer else 'black'
-                font_style = "bold" if display_name == next_prayer else "regular"
-                
-                prayer_font = self.get_font(font_style, 20)
-                time_display_font = self.get_font(font_style, 20)
-                
-                # Format time for display (convert from 24h to 12h if needed)
-                if prayer_time != "N/A":
-                    try:
-                        time_obj = datetime.strptime(prayer_time, "%H:%M")
-                        formatted_time = time_obj.strftime("%I:%M %p").lstrip('0')
-                    except:
-                        formatted_time = prayer_time
-                else:
-                    formatted_time = "N/A"
-                
-                draw.text((name_x, y_pos), display_name, font=prayer_font, 
-                         fill=self.colors[text_color])
-                draw.text((time_x, y_pos), formatted_time, font=time_display_font, 
-                         fill=self.colors[text_color])
-            
+            black_mask, green_mask = self._render_row_masks(next_prayer, time_x - name_x)
+            for mask, tint_color in ((black_mask, black), (green_mask, green)):
+                if mask is not None:
+                    tint = Image.new('RGB', mask.size, tint_color)
+                    image.paste(tint, (name_x, line_y + 20), mask)
+
             # Next prayer info box
             if next_prayer and next_time:
                 box_y = line_y + 20 + (len(self.prayer_names) * row_height) + 30
-                
-                # Draw box background
+
+                # Box outline
                 box_left = 100
                 box_right = self.width - 100
-                box_top = box_y
-                box_bottom = box_y + 80
-                
-                draw.rectangle([box_left, box_top, box_right, box_bottom], 
-                              outline=self.colors['green'], width=3)
-                
+                ops.append(('rectangle', ([box_left, box_y, box_right, box_y + 80], 3),
+                            None, green))
+
                 # Next prayer text
-                next_font = self.get_font("bold", 24)
-                next_text = "Next Prayer:"
-                self.draw_text_centered(draw, next_text, box_y + 15, next_font, 'green')
-                
+                ops.append(('text_centered', ("Next Prayer:", box_y + 15),
+                            ("bold", 24), 'green'))
+
                 # Prayer name and time
                 prayer_info = f"{next_prayer} at {next_time}"
                 if not is_today:
                     prayer_info += " (Tomorrow)"
-                
-                info_font = self.get_font("regular", 22)
-                self.draw_text_centered(draw, prayer_info, box_y + 45, info_font, 'black')
-            
+
+                ops.append(('text_centered', (prayer_info, box_y + 45),
+                            ("regular", 22), 'black'))
+
+            self.draw_batch(draw, ops)
+
             # Location info in footer
             location_text = f"Location: {self.get_config_value('latitude', 38.90):.2f}, {self.get_config_value('longitude', -77.26):.2f}"
             self.draw_footer(draw, location_text)
@@ -224,4 +356,7 @@ class PrayerPlugin(BasePlugin):
             
         except Exception as e:
             self.log_error(f"Failed to render error message: {e}")
-            return False
\ No newline at end of file
+            return False
+
+# Explicit registry entry used by PluginManager._load_plugin
+PLUGIN_CLASS = PrayerPlugin
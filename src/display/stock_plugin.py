@@ -2,79 +2,263 @@
 """
 Stock Market Plugin for eInk InfoDisplay
 """
+import json
+import os
 import requests
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
+from requests.adapters import HTTPAdapter, Retry
+from PIL import Image, ImageChops, ImageDraw
 from .base_plugin import BasePlugin
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
+def _parse_json(response):
+    """Decode a response body, using orjson's C decoder when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Market hours as a (weekday, hour) bitmask built once at import; the
+# per-render check is then a single shift-and-mask instead of a branch
+# chain. Bits cover Monday-Friday, 9 AM - 4 PM (rough ET approximation,
+# no holiday calendar).
+_MARKET_MASK = 0
+for _wd in range(5):
+    for _h in range(9, 16):
+        _MARKET_MASK |= 1 << (_wd * 24 + _h)
+del _wd, _h
+
 class StockPlugin(BasePlugin):
     """Stock market plugin showing current prices and changes"""
-    
+
     def __init__(self, config_manager, display_manager, plugin_config=None):
         super().__init__(config_manager, display_manager, plugin_config)
-        
+
         self.name = "stock"
         self.description = "Stock market quotes"
         self.update_interval = self.get_config_value('update_interval', 1800)  # 30 minutes
-        
+
         # Stock data cache
         self.stock_data = {}
-        
+
+        # Config snapshot; these don't change at runtime, so the fetch
+        # path reads attributes instead of re-walking config dicts
+        self._api_key = (self.get_config_value('api_key', '') or
+                         self.config.get_section("api_keys", {}).get("finnhub", ""))
+        self._symbols = tuple(self.get_config_value('symbols',
+                                                    ['AAPL', 'GOOGL', 'MSFT']))
+
+        # Per-symbol TTL cache: symbol -> (expires_at, data, etag). Fresh
+        # entries skip the network; stale ones revalidate with
+        # If-None-Match so an unchanged quote costs a body-less 304
+        self._cache = {}
+        self._last_fetch = 0.0
+
+        # Last-good payload on disk: cold starts within the TTL render
+        # without network I/O, and outages fall back to stale data
+        # instead of an error page
+        self._cache_dir = Path.home() / ".cache" / "einkocube"
+        self._disk_cache = self._cache_dir / "stock.json"
+
+        # Pooled session so the per-symbol fetches reuse one TCP+TLS
+        # connection instead of handshaking finnhub.io for every ticker
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])))
+
+        # Long-lived worker pool for the fetch fan-out; spawning threads
+        # per refresh would pay the startup cost every 30 minutes
+        self._executor = ThreadPoolExecutor(max_workers=8,
+                                            thread_name_prefix='stock-fetch')
+
+        # With httpx (and its h2 extra) installed, all quote GETs
+        # multiplex over a single HTTP/2 TLS connection instead of one
+        # HTTP/1.1 socket per in-flight request
+        self._client = None
+        if httpx is not None:
+            try:
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=4,
+                                        max_connections=16),
+                    timeout=httpx.Timeout(10.0, connect=3.0))
+            except ImportError:
+                # httpx present but the h2 extra is not
+                self._client = None
+
+        # Static chrome pre-rasterized on first render: the table header
+        # row and the market status pills never change, so render()
+        # pastes tiles instead of re-shaping the same glyphs
+        self._header_tile = None
+        self._status_tiles = {}
+
+        # Reusable frame buffer, allocated on first render, plus a copy
+        # of the last pushed frame for the dirty diff in render()
+        self._frame = None
+        self._last_frame = None
+
+    def cleanup(self):
+        """Release the worker pool and pooled HTTP connections"""
+        self._executor.shutdown(wait=False)
+        if self._client is not None:
+            self._client.close()
+        self._session.close()
+
     def _fetch_stock_data(self):
         """Fetch stock data from API"""
-        api_key = self.get_config_value('api_key', '')
-        if not api_key:
-            # Try to get from main config
-            api_key = self.config.get("api_keys", {}).get("finnhub", "")
-        
+        api_key = self._api_key
         if not api_key:
             self.log_error("No Finnhub API key configured")
             return False
-        
-        symbols = self.get_config_value('symbols', ['AAPL', 'GOOGL', 'MSFT'])
-        
+
+        symbols = self._symbols
+
+        now = time.monotonic()
+
+        # Repaints within the update interval (e.g. plugin rotation)
+        # reuse the last data without touching the network at all
+        if self.stock_data and now - self._last_fetch < self.update_interval:
+            return True
+
+        # Cold start: a fresh-enough on-disk payload skips the network
+        if not self.stock_data:
+            blob = self._load_disk_cache()
+            if blob is not None and time.time() - blob['ts'] < self.update_interval:
+                self.stock_data = blob['data']
+                self._last_fetch = now
+                return True
+
         try:
             self.stock_data = {}
-            
+
+            # Use Finnhub quote endpoint (free tier)
+            url = "https://finnhub.io/api/v1/quote"
+
+            # Symbols with a fresh cache entry skip the fetch entirely
+            to_fetch = []
             for symbol in symbols:
-                # Use Finnhub quote endpoint (free tier)
-                url = "https://finnhub.io/api/v1/quote"
-                params = {
-                    'symbol': symbol,
-                    'token': api_key
-                }
-                
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    
+                cached = self._cache.get(symbol)
+                if cached is not None and now < cached[0]:
+                    self.stock_data[symbol] = cached[1]
+                else:
+                    to_fetch.append(symbol)
+
+            def _fetch_one(sym):
+                params = {'symbol': sym, 'token': api_key}
+                cached = self._cache.get(sym)
+                headers = {'If-None-Match': cached[2]} if cached and cached[2] else None
+                if self._client is not None:
+                    return sym, self._client.get(url, params=params, headers=headers)
+                return sym, self._session.get(url, params=params,
+                                              headers=headers, timeout=(3.05, 10))
+
+            # Each quote is one network round trip, so issue them all at
+            # once; the threads share the pooled session from __init__
+            futures = [self._executor.submit(_fetch_one, s) for s in to_fetch]
+            for future in as_completed(futures):
+                symbol, response = future.result()
+                if response.status_code == 304:
+                    # Quote unchanged upstream - refresh the TTL and
+                    # reuse the cached data
+                    cached = self._cache[symbol]
+                    self._cache[symbol] = (now + self.update_interval,
+                                           cached[1], cached[2])
+                    self.stock_data[symbol] = cached[1]
+                elif response.status_code == 200:
+                    data = _parse_json(response)
+
                     if data.get('c', 0) > 0:  # Check if we got valid data
-                        self.stock_data[symbol] = {
+                        change = data['c'] - data['pc']
+                        entry = {
                             'current': data['c'],           # Current price
                             'previous_close': data['pc'],   # Previous close
                             'high': data['h'],              # Day high
                             'low': data['l'],               # Day low
                             'open': data['o'],              # Day open
-                            'change': data['c'] - data['pc'],
-                            'change_percent': ((data['c'] - data['pc']) / data['pc']) * 100 if data['pc'] > 0 else 0
+                            'change': change,
+                            'change_percent': (change / data['pc']) * 100 if data['pc'] > 0 else 0,
+                            # Row color resolved here so the render loop
+                            # has no per-row sign branch or dict lookups
+                            'color': self.colors['green'] if change >= 0 else self.colors['red']
                         }
+                        self._cache[symbol] = (now + self.update_interval,
+                                               entry, response.headers.get('ETag'))
+                        self.stock_data[symbol] = entry
                     else:
                         self.log_warning(f"No data received for {symbol}")
                 else:
                     self.log_error(f"Stock API error for {symbol}: {response.status_code}")
-            
+
             if self.stock_data:
+                self._last_fetch = now
+                self._save_disk_cache()
                 self.log_info(f"Stock data fetched for {len(self.stock_data)} symbols")
                 return True
             else:
                 self.log_error("No valid stock data received")
-                return False
-                
+                return self._fallback_to_disk()
+
         except Exception as e:
             self.log_error(f"Error fetching stock data: {e}")
-            return False
+            return self._fallback_to_disk()
+
+    def _load_disk_cache(self):
+        """Read the persisted payload, or None if missing/corrupt"""
+        try:
+            raw = self._disk_cache.read_bytes()
+        except OSError:
+            return None
+        try:
+            blob = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError:
+            return None
+
+        # JSON round-trips the precomputed RGB 'color' tuples as lists,
+        # which Pillow rejects as fill values - restore them on load
+        try:
+            for entry in blob['data'].values():
+                entry['color'] = tuple(entry['color'])
+        except (KeyError, TypeError, AttributeError):
+            return None
+        return blob
+
+    def _save_disk_cache(self):
+        """Persist the current payload to disk (atomic rename)"""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            blob = {'ts': time.time(), 'data': self.stock_data}
+            payload = (orjson.dumps(blob) if orjson is not None
+                       else json.dumps(blob).encode('utf-8'))
+            tmp_path = self._disk_cache.with_suffix('.tmp')
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self._disk_cache)
+        except OSError as e:
+            self.log_warning(f"Could not cache stock data: {e}")
+
+    def _fallback_to_disk(self):
+        """Serve stale on-disk data when the API is unreachable"""
+        blob = self._load_disk_cache()
+        if blob is not None and blob.get('data'):
+            self.log_warning("Using stale cached stock data after fetch failure")
+            self.stock_data = blob['data']
+            return True
+        return False
     
     def render(self):
         """Render the stock display"""
@@ -83,10 +267,17 @@ class StockPlugin(BasePlugin):
             if not self._fetch_stock_data():
                 return self._render_error()
             
-            # Create image
-            image = self.create_image('white')
+            # Reuse one frame buffer across renders; resetting it to the
+            # cached chrome is an in-place blit instead of a fresh
+            # full-frame allocation per refresh (show_image quantizes or
+            # copies on enqueue, so the queued frame never aliases this)
+            if self._frame is None:
+                self._frame = self.create_image('white')
+            else:
+                self._frame.paste(self._chrome, (0, 0))
+            image = self._frame
             draw = self.create_draw(image)
-            
+
             # Draw header
             header_y = self.draw_header(draw, "Stock Market")
             
@@ -96,26 +287,29 @@ class StockPlugin(BasePlugin):
             status_text = "Market Open" if market_hours else "Market Closed"
             status_color = 'green' if market_hours else 'red'
             
-            status_font = self.get_font("bold", 20)
-            self.draw_text_centered(draw, status_text, header_y + 10, status_font, status_color)
-            
+            status_tile = self._status_tiles.get(market_hours)
+            if status_tile is None:
+                status_tile = self._render_text_tile(
+                    status_text, self.get_font("bold", 20), status_color)
+                self._status_tiles[market_hours] = status_tile
+            image.paste(status_tile,
+                        ((self.width - status_tile.width) // 2, header_y + 10))
+
             # Stock table
             table_y = header_y + 60
-            
-            # Table headers
-            header_font = self.get_font("bold", 20)
-            
+
             # Column positions for stock table
             symbol_x = 80
             price_x = 250
             change_x = 400
             percent_x = 550
-            
-            draw.text((symbol_x, table_y), "Symbol", font=header_font, fill=self.colors['black'])
-            draw.text((price_x, table_y), "Price", font=header_font, fill=self.colors['black'])
-            draw.text((change_x, table_y), "Change", font=header_font, fill=self.colors['black'])
-            draw.text((percent_x, table_y), "Change %", font=header_font, fill=self.colors['black'])
-            
+
+            # Table header row as a single pre-rasterized tile
+            if self._header_tile is None:
+                self._header_tile = self._build_header_tile(
+                    symbol_x, price_x, change_x, percent_x)
+            image.paste(self._header_tile, (symbol_x, table_y))
+
             # Draw line under headers
             line_y = table_y + 30
             draw.line([(50, line_y), (self.width - 50, line_y)], 
@@ -127,32 +321,24 @@ class StockPlugin(BasePlugin):
             bold_font = self.get_font("bold", 18)
             
             sorted_stocks = sorted(self.stock_data.items())
-            
-            for i, (symbol, data) in enumerate(sorted_stocks):
-                if i >= 8:  # Limit to 8 stocks to fit on screen
-                    break
-                    
-                y_pos = line_y + 20 + (i * row_height)
-                
-                # Symbol
-                draw.text((symbol_x, y_pos), symbol, font=bold_font, fill=self.colors['black'])
-                
-                # Current price
-                price_str = f"${data['current']:.2f}"
-                draw.text((price_x, y_pos), price_str, font=data_font, fill=self.colors['black'])
-                
-                # Change amount and color
-                change = data['change']
-                change_str = f"${change:+.2f}"
-                change_color = 'green' if change >= 0 else 'red'
-                
-                draw.text((change_x, y_pos), change_str, font=data_font, fill=self.colors[change_color])
-                
-                # Change percent
-                percent = data['change_percent']
-                percent_str = f"{percent:+.1f}%"
-                
-                draw.text((percent_x, y_pos), percent_str, font=data_font, fill=self.colors[change_color])
+
+            # Lay out the visible rows up front (limit 8 to fit on
+            # screen), then replay them with the draw callable and black
+            # bound to locals so the loop body is straight C draw calls
+            rows = [
+                (line_y + 20 + i * row_height, symbol,
+                 f"${data['current']:.2f}", f"${data['change']:+.2f}",
+                 f"{data['change_percent']:+.1f}%", data['color'])
+                for i, (symbol, data) in enumerate(sorted_stocks[:8])
+            ]
+
+            draw_text = draw.text
+            black = self.colors['black']
+            for y_pos, symbol, price_str, change_str, percent_str, color in rows:
+                draw_text((symbol_x, y_pos), symbol, font=bold_font, fill=black)
+                draw_text((price_x, y_pos), price_str, font=data_font, fill=black)
+                draw_text((change_x, y_pos), change_str, font=data_font, fill=color)
+                draw_text((percent_x, y_pos), percent_str, font=data_font, fill=color)
             
             # Market summary section (if space allows)
             if len(sorted_stocks) <= 5:  # Only show if we have room
@@ -178,38 +364,62 @@ class StockPlugin(BasePlugin):
             footer_text = f"Updated: {now.strftime('%H:%M')} • Data delayed"
             self.draw_footer(draw, footer_text)
             
+            # The Inky driver can only refresh the whole panel, so the
+            # dirty diff is used to drop unchanged frames before they
+            # reach the (comparatively costly) quantize/hash path
+            if (self._last_frame is not None and
+                    ImageChops.difference(image, self._last_frame).getbbox() is None):
+                self.log_info("Stock frame unchanged - skipping display push")
+                return True
+
             # Show the image
             self.show_image(image)
+            self._last_frame = image.copy()
             self.log_info(f"Stock display updated with {len(self.stock_data)} symbols")
-            
+
             return True
             
         except Exception as e:
             self.log_error(f"Failed to render stocks: {e}")
             return self._render_error()
     
+    def _build_header_tile(self, symbol_x, price_x, change_x, percent_x):
+        """Rasterize the four column headers into one tile
+
+        Args:
+            symbol_x: X coordinate of the symbol column (tile origin)
+            price_x: X coordinate of the price column
+            change_x: X coordinate of the change column
+            percent_x: X coordinate of the change-percent column
+
+        Returns:
+            PIL Image tile with the header row on a white background
+        """
+        font = self.get_font("bold", 20)
+        dummy = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+        last_width = dummy.textbbox((0, 0), "Change %", font=font)[2]
+
+        tile = Image.new('RGB', (percent_x - symbol_x + last_width, 30),
+                         self.colors['white'])
+        tile_draw = ImageDraw.Draw(tile)
+        black = self.colors['black']
+        for text, x in (("Symbol", symbol_x), ("Price", price_x),
+                        ("Change", change_x), ("Change %", percent_x)):
+            tile_draw.text((x - symbol_x, 0), text, font=font, fill=black)
+        return tile
+
     def _is_market_hours(self, dt):
         """Simple check if it's during market hours (US Eastern Time)
-        
+
         Args:
             dt: datetime object
-            
+
         Returns:
             True if likely during market hours
         """
-        # This is a simplified check - doesn't account for holidays or timezone
-        weekday = dt.weekday()  # 0 = Monday, 6 = Sunday
-        hour = dt.hour
-        
-        # Market typically open Monday-Friday, 9:30 AM - 4:00 PM ET
-        # This is a rough approximation
-        if weekday >= 5:  # Weekend
-            return False
-        
-        if hour < 9 or hour >= 16:  # Before 9 AM or after 4 PM
-            return False
-        
-        return True
+        # Single lookup in the precomputed (weekday, hour) bitmask; see
+        # _MARKET_MASK for the approximation caveats
+        return bool((_MARKET_MASK >> (dt.weekday() * 24 + dt.hour)) & 1)
     
     def _render_error(self):
         """Render error message"""
@@ -233,4 +443,7 @@ class StockPlugin(BasePlugin):
             
         except Exception as e:
             self.log_error(f"Failed to render error message: {e}")
-            return False
\ No newline at end of file
+            return False
+
+# Explicit registry entry used by PluginManager._load_plugin
+PLUGIN_CLASS = StockPlugin
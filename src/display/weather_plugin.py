@@ -2,76 +2,320 @@
 """
 Weather Plugin for eInk InfoDisplay
 """
+import json
+import os
 import requests
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+from requests.adapters import HTTPAdapter, Retry
+from PIL import ImageChops
 from .base_plugin import BasePlugin
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _parse_json(response):
+    """Decode a response body, using orjson's C decoder when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Compass points hoisted to a module-level tuple so _wind_direction
+# doesn't rebuild a 16-element list on every render
+_WIND_DIRS = (
+    "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+    "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"
+)
+
 class WeatherPlugin(BasePlugin):
     """Weather plugin showing current conditions and forecast"""
-    
+
     def __init__(self, config_manager, display_manager, plugin_config=None):
         super().__init__(config_manager, display_manager, plugin_config)
-        
+
         self.name = "weather"
         self.description = "Current weather and forecast"
         self.update_interval = self.get_config_value('update_interval', 1800)  # 30 minutes
-        
+
         # Weather data cache
         self.weather_data = None
         self.forecast_data = None
-        
+
+        # Config snapshot; these don't change at runtime, so the fetch
+        # and render paths read attributes instead of re-walking config
+        self._api_key = self.config.get_section("api_keys", {}).get("openweathermap", "")
+        self._city_id = self.get_config_value('city_id', 4791160)  # Default: Washington, DC
+        self._units = self.get_config_value('units', 'imperial')
+        self._latitude = self.get_config_value('latitude')
+        self._longitude = self.get_config_value('longitude')
+
+        imperial = self._units == 'imperial'
+        self._temp_unit = '°F' if imperial else '°C'
+        self._speed_unit = 'mph' if imperial else 'm/s'
+        self._vis_factor = 0.621371 if imperial else 1.0
+        self._vis_unit = 'mi' if imperial else 'km'
+
+        # Per-endpoint TTL cache: name -> (expires_at, data, etag); stale
+        # entries revalidate with If-None-Match so an unchanged report
+        # costs a body-less 304
+        self._cache = {}
+        self._last_fetch = 0.0
+
+        # Last-good payload on disk: cold starts within the TTL render
+        # without network I/O, and outages fall back to stale data
+        # instead of an error page
+        self._cache_dir = Path.home() / ".cache" / "einkocube"
+        self._disk_cache = self._cache_dir / "weather.json"
+
+        # OneCall batches current + hourly into one round trip when
+        # coordinates are configured; cleared on 401 so keys without the
+        # subscription settle on the legacy endpoints after one attempt
+        self._use_onecall = True
+
+        # Pooled session shared by the current and forecast calls so
+        # both reuse one TCP+TLS connection to api.openweathermap.org
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])))
+
+        # Long-lived worker pool for the two-call fan-out, created once
+        # rather than per refresh
+        self._executor = ThreadPoolExecutor(max_workers=2,
+                                            thread_name_prefix='weather-fetch')
+
+        # Static forecast section header, rasterized once on first render
+        self._forecast_header_tile = None
+
+        # Reusable frame buffer, allocated on first render, plus a copy
+        # of the last pushed frame for the dirty diff in render()
+        self._frame = None
+        self._last_frame = None
+
+    def cleanup(self):
+        """Release the worker pool and pooled HTTP connections"""
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
     def _fetch_weather_data(self):
         """Fetch weather data from OpenWeatherMap API"""
-        api_key = self.config.get("api_keys", {}).get("openweathermap", "")
+        api_key = self._api_key
         if not api_key:
             self.log_error("No OpenWeatherMap API key configured")
             return False
-        
-        city_id = self.get_config_value('city_id', 4791160)  # Default: Washington, DC
-        units = self.get_config_value('units', 'imperial')
-        
+
+        city_id = self._city_id
+        units = self._units
+        latitude = self._latitude
+        longitude = self._longitude
+
+        now = time.monotonic()
+
+        # Repaints within the update interval reuse the last data
+        # without touching the network at all
+        if self.weather_data and now - self._last_fetch < self.update_interval:
+            return True
+
+        # Cold start: a fresh-enough on-disk payload skips the network
+        if self.weather_data is None:
+            blob = self._load_disk_cache()
+            if blob is not None and time.time() - blob['ts'] < self.update_interval:
+                self.weather_data = blob['weather']
+                self.forecast_data = blob.get('forecast')
+                self._last_fetch = now
+                return True
+
         try:
-            # Fetch current weather
+            # One OneCall round trip replaces the two legacy calls when
+            # coordinates are configured
+            if self._use_onecall and latitude is not None and longitude is not None:
+                status = self._fetch_onecall(api_key, latitude, longitude, units, now)
+                if status == 200:
+                    self._last_fetch = now
+                    self._save_disk_cache()
+                    return True
+                if status == 401:
+                    self.log_warning(
+                        "OneCall not enabled for this key - using legacy endpoints")
+                    self._use_onecall = False
+                else:
+                    return self._fallback_to_disk()
+
+            # Current conditions and 5-day forecast endpoints
             current_url = "https://api.openweathermap.org/data/2.5/weather"
             current_params = {
                 'id': city_id,
                 'appid': api_key,
                 'units': units
             }
-            
-            response = requests.get(current_url, params=current_params, timeout=10)
-            if response.status_code == 200:
-                self.weather_data = response.json()
-                self.log_info("Weather data fetched successfully")
-            else:
-                self.log_error(f"Weather API error: {response.status_code}")
-                return False
-            
-            # Fetch 5-day forecast
+
             forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
             forecast_params = {
                 'id': city_id,
                 'appid': api_key,
                 'units': units,
-                'cnt': 8  # Next 24 hours (8 x 3-hour periods)
+                'cnt': 4  # Only 4 periods are rendered, so only ask for 4
             }
-            
-            response = requests.get(forecast_url, params=forecast_params, timeout=10)
-            if response.status_code == 200:
-                self.forecast_data = response.json()
+
+            # Both calls are independent round trips, so issue them
+            # concurrently over the pooled session; the forecast body is
+            # streamed so it can be read with a hard size cap
+            def _get(args):
+                name, url, params = args
+                cached = self._cache.get(name)
+                headers = {'If-None-Match': cached[2]} if cached and cached[2] else None
+                return self._session.get(url, params=params, headers=headers,
+                                         stream=(name == 'forecast'),
+                                         timeout=(3.05, 10))
+
+            current_resp, forecast_resp = self._executor.map(
+                _get, [('weather', current_url, current_params),
+                       ('forecast', forecast_url, forecast_params)])
+
+            if current_resp.status_code == 304:
+                cached = self._cache['weather']
+                self._cache['weather'] = (now + self.update_interval,
+                                          cached[1], cached[2])
+                self.weather_data = cached[1]
+            elif current_resp.status_code == 200:
+                self.weather_data = _parse_json(current_resp)
+                self._cache['weather'] = (now + self.update_interval,
+                                          self.weather_data,
+                                          current_resp.headers.get('ETag'))
+                self.log_info("Weather data fetched successfully")
+            else:
+                self.log_error(f"Weather API error: {current_resp.status_code}")
+                return self._fallback_to_disk()
+
+            if forecast_resp.status_code == 304:
+                cached = self._cache['forecast']
+                self._cache['forecast'] = (now + self.update_interval,
+                                           cached[1], cached[2])
+                self.forecast_data = cached[1]
+            elif forecast_resp.status_code == 200:
+                # Capped read instead of materializing .content; 64 KB is
+                # far above the few-period payload asked for above
+                body = forecast_resp.raw.read(65536, decode_content=True)
+                self.forecast_data = (orjson.loads(body) if orjson is not None
+                                      else json.loads(body))
+                self._cache['forecast'] = (now + self.update_interval,
+                                           self.forecast_data,
+                                           forecast_resp.headers.get('ETag'))
                 self.log_info("Forecast data fetched successfully")
             else:
-                self.log_warning(f"Forecast API error: {response.status_code}")
-            
+                self.log_warning(f"Forecast API error: {forecast_resp.status_code}")
+
+            self._last_fetch = now
+            self._save_disk_cache()
             return True
-            
+
         except Exception as e:
             self.log_error(f"Error fetching weather data: {e}")
-            return False
+            return self._fallback_to_disk()
+
+    def _load_disk_cache(self):
+        """Read the persisted payload, or None if missing/corrupt"""
+        try:
+            raw = self._disk_cache.read_bytes()
+        except OSError:
+            return None
+        try:
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError:
+            return None
+
+    def _save_disk_cache(self):
+        """Persist the current payload to disk (atomic rename)"""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            blob = {'ts': time.time(), 'weather': self.weather_data,
+                    'forecast': self.forecast_data}
+            payload = (orjson.dumps(blob) if orjson is not None
+                       else json.dumps(blob).encode('utf-8'))
+            tmp_path = self._disk_cache.with_suffix('.tmp')
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self._disk_cache)
+        except OSError as e:
+            self.log_warning(f"Could not cache weather data: {e}")
+
+    def _fallback_to_disk(self):
+        """Serve stale on-disk data when the API is unreachable"""
+        blob = self._load_disk_cache()
+        if blob is not None and blob.get('weather'):
+            self.log_warning("Using stale cached weather data after fetch failure")
+            self.weather_data = blob['weather']
+            self.forecast_data = blob.get('forecast')
+            return True
+        return False
     
+    def _fetch_onecall(self, api_key, latitude, longitude, units, now):
+        """Fetch current and hourly weather in a single OneCall request
+
+        The response is reshaped into the legacy current/forecast dicts
+        so the render path is unchanged.
+
+        Args:
+            api_key: OpenWeatherMap API key
+            latitude: Location latitude
+            longitude: Location longitude
+            units: Units system ('imperial' or 'metric')
+            now: Current monotonic timestamp for the TTL cache
+
+        Returns:
+            HTTP status code of the request (200 when data was reused
+            from a 304 revalidation)
+        """
+        cached = self._cache.get('onecall')
+        headers = {'If-None-Match': cached[2]} if cached and cached[2] else None
+        response = self._session.get(
+            "https://api.openweathermap.org/data/3.0/onecall",
+            params={'lat': latitude, 'lon': longitude, 'appid': api_key,
+                    'units': units, 'exclude': 'minutely,daily,alerts'},
+            headers=headers, timeout=(3.05, 10))
+
+        if response.status_code == 304:
+            data = cached[1]
+            self._cache['onecall'] = (now + self.update_interval, data, cached[2])
+        elif response.status_code == 200:
+            data = _parse_json(response)
+            self._cache['onecall'] = (now + self.update_interval, data,
+                                      response.headers.get('ETag'))
+            self.log_info("OneCall weather data fetched successfully")
+        else:
+            if response.status_code != 401:
+                self.log_error(f"OneCall API error: {response.status_code}")
+            return response.status_code
+
+        current = data.get('current', {})
+        self.weather_data = {
+            'name': self.get_config_value('city_name', 'Local'),
+            'main': {
+                'temp': current.get('temp', 0),
+                'feels_like': current.get('feels_like', 0),
+                'humidity': current.get('humidity', 0),
+                'pressure': current.get('pressure', 0)
+            },
+            'weather': current.get('weather', [{'description': '', 'main': ''}]),
+            'wind': {'speed': current.get('wind_speed', 0),
+                     'deg': current.get('wind_deg', 0)},
+            'visibility': current.get('visibility', 0)
+        }
+        # Reshape hourly entries into the legacy forecast list
+        self.forecast_data = {'list': [
+            {'dt': hour['dt'], 'main': {'temp': hour['temp']},
+             'weather': hour['weather']}
+            for hour in data.get('hourly', [])[:8]
+        ]}
+        return 200
+
     def render(self):
         """Render the weather display"""
         try:
@@ -79,15 +323,24 @@ class WeatherPlugin(BasePlugin):
             if not self._fetch_weather_data():
                 return self._render_error()
             
-            # Create image
-            image = self.create_image('white')
+            # Reuse one frame buffer across renders; resetting it to the
+            # cached chrome is an in-place blit instead of a fresh
+            # full-frame allocation per refresh (show_image quantizes or
+            # copies on enqueue, so the queued frame never aliases this)
+            if self._frame is None:
+                self._frame = self.create_image('white')
+            else:
+                self._frame.paste(self._chrome, (0, 0))
+            image = self._frame
             draw = self.create_draw(image)
-            
-            # Get units symbol
-            units = self.get_config_value('units', 'imperial')
-            temp_unit = '°F' if units == 'imperial' else '°C'
-            speed_unit = 'mph' if units == 'imperial' else 'm/s'
-            
+
+            # One timestamp read serves the whole frame
+            now = datetime.now()
+
+            # Unit symbols precomputed in __init__
+            temp_unit = self._temp_unit
+            speed_unit = self._speed_unit
+
             # Draw header with city name
             city_name = self.weather_data.get('name', 'Unknown')
             header_y = self.draw_header(draw, f"Weather - {city_name}")
@@ -133,22 +386,21 @@ class WeatherPlugin(BasePlugin):
             wind_dir_str = self._wind_direction(wind_dir)
             draw.text((right_x, details_y + 30), f"Direction: {wind_dir_str}", font=detail_font, fill=self.colors['black'])
             
-            visibility = self.weather_data.get('visibility', 0) / 1000  # Convert to km
-            if units == 'imperial':
-                visibility *= 0.621371  # Convert to miles
-                vis_unit = 'mi'
-            else:
-                vis_unit = 'km'
-            draw.text((right_x, details_y + 60), f"Visibility: {visibility:.1f} {vis_unit}", 
-                     font=detail_font, fill=self.colors['black'])
+            # km, scaled to miles for imperial via the cached factor
+            visibility = self.weather_data.get('visibility', 0) / 1000 * self._vis_factor
+            draw.text((right_x, details_y + 60),
+                      f"Visibility: {visibility:.1f} {self._vis_unit}",
+                      font=detail_font, fill=self.colors['black'])
             
             # Forecast section (if available)
             if self.forecast_data and len(self.forecast_data.get('list', [])) > 0:
                 forecast_y = details_y + 120
                 
-                # Forecast header
-                forecast_font = self.get_font("bold", 24)
-                draw.text((50, forecast_y), "Next 24 Hours:", font=forecast_font, fill=self.colors['green'])
+                # Forecast header (pre-rasterized tile)
+                if self._forecast_header_tile is None:
+                    self._forecast_header_tile = self._render_text_tile(
+                        "Next 24 Hours:", self.get_font("bold", 24), 'green')
+                image.paste(self._forecast_header_tile, (50, forecast_y))
                 
                 # Show next few forecasts
                 forecast_items = self.forecast_data['list'][:4]  # Next 4 periods (12 hours)
@@ -169,13 +421,21 @@ class WeatherPlugin(BasePlugin):
                     draw.text((70, y_pos), forecast_line, font=forecast_detail_font, fill=self.colors['black'])
             
             # Footer with update time
-            update_time = datetime.now().strftime("%H:%M")
-            self.draw_footer(draw, f"Updated: {update_time}")
+            self.draw_footer(draw, f"Updated: {now.strftime('%H:%M')}")
             
+            # The Inky driver can only refresh the whole panel, so the
+            # dirty diff is used to drop unchanged frames before they
+            # reach the (comparatively costly) quantize/hash path
+            if (self._last_frame is not None and
+                    ImageChops.difference(image, self._last_frame).getbbox() is None):
+                self.log_info("Weather frame unchanged - skipping display push")
+                return True
+
             # Show the image
             self.show_image(image)
+            self._last_frame = image.copy()
             self.log_info(f"Weather updated for {city_name}")
-            
+
             return True
             
         except Exception as e:
@@ -206,22 +466,22 @@ class WeatherPlugin(BasePlugin):
             self.log_error(f"Failed to render error message: {e}")
             return False
     
-    def _wind_direction(self, degrees):
+    @staticmethod
+    def _wind_direction(degrees):
         """Convert wind direction degrees to compass direction
-        
+
         Args:
             degrees: Wind direction in degrees
-            
+
         Returns:
             Compass direction string
         """
         if degrees is None:
             return "N/A"
-        
-        directions = [
-            "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
-            "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"
-        ]
-        
-        index = round(degrees / 22.5) % 16
-        return directions[index]
\ No newline at end of file
+
+        # Half-up binning with plain integer truncation; avoids the
+        # round() call and its banker's-rounding float path
+        return _WIND_DIRS[int(degrees * 16 / 360 + 0.5) & 15]
+
+# Explicit registry entry used by PluginManager._load_plugin
+PLUGIN_CLASS = WeatherPlugin
@@ -7,6 +7,7 @@ import sys
 import time
 import json
 import logging
+import logging.handlers
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -20,23 +21,37 @@ from src.display.plugin_manager import PluginManager
 from src.config_manager import ConfigManager
 
 # Set up logging
-def setup_logging():
-    """Set up logging configuration"""
+def setup_logging(daemon=False):
+    """Set up logging configuration
+
+    Args:
+        daemon: True when running as a daemon; console output is then
+            limited to warnings while the file keeps full INFO
+    """
     log_dir = project_root / "logs"
     log_dir.mkdir(exist_ok=True)
-    
+
     log_file = log_dir / "eink_display.log"
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # Rotating file capped at ~2 MB so the log can't grow unbounded,
+    # fronted by a memory buffer so steady-state INFO records cost no
+    # write syscalls; the buffer flushes every 100 records, on any
+    # WARNING+, and at interpreter shutdown
+    rotating = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=2_000_000, backupCount=3)
+    rotating.setFormatter(formatter)
+    buffered = logging.handlers.MemoryHandler(
+        capacity=100, flushLevel=logging.WARNING, target=rotating)
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(formatter)
+    if daemon:
+        stream.setLevel(logging.WARNING)
+
+    logging.basicConfig(level=logging.INFO, handlers=[buffered, stream])
+
     return logging.getLogger(__name__)
 
 def parse_arguments():
@@ -53,6 +68,9 @@ def parse_arguments():
                        help="Run as daemon (continuous mode)")
     parser.add_argument("--update-interval", type=int, default=300,
                        help="Update interval in seconds (default: 300)")
+    parser.add_argument("--count", type=int, default=1,
+                       help="Number of update cycles to run (managers are "
+                            "initialized once and shared)")
     parser.add_argument("--verbose", "-v", action="store_true", 
                        help="Enable verbose logging")
     
@@ -76,7 +94,12 @@ class EInkInfoDisplay:
         self.running = False
         
     def initialize(self):
-        """Initialize display and plugin managers"""
+        """Initialize display and plugin managers (idempotent)"""
+        # Re-running setup would re-probe the panel and reload every
+        # plugin; repeated calls just reuse the existing managers
+        if self.display_manager is not None:
+            return True
+
         try:
             # Initialize display manager
             self.display_manager = EInkDisplayManager(self.config_manager)
@@ -162,33 +185,38 @@ class EInkInfoDisplay:
         
         self.running = True
         self.logger.info(f"Starting daemon mode (update interval: {update_interval}s)")
-        
+
         # Initial update
         self.plugin_manager.update_display()
         self.last_update = datetime.now()
-        
+
+        # Drift-free schedule on the monotonic clock: sleep until the
+        # next due time instead of polling every 30 seconds. Sleeps are
+        # capped so stop() is noticed within a minute.
+        next_due = time.monotonic() + update_interval
+
         try:
             while self.running:
-                current_time = datetime.now()
-                
-                # Check if it's time to update
-                if (current_time - self.last_update).total_seconds() >= update_interval:
-                    self.logger.info("Performing scheduled update...")
-                    
-                    try:
-                        success = self.plugin_manager.update_display()
-                        if success:
-                            self.last_update = current_time
-                            self.logger.info("Scheduled update completed")
-                        else:
-                            self.logger.error("Scheduled update failed")
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error during scheduled update: {e}")
-                
-                # Sleep for 30 seconds before checking again
-                time.sleep(30)
-                
+                remaining = next_due - time.monotonic()
+                if remaining > 0:
+                    time.sleep(min(remaining, 60))
+                    continue
+
+                self.logger.info("Performing scheduled update...")
+
+                try:
+                    success = self.plugin_manager.update_display()
+                    if success:
+                        self.last_update = datetime.now()
+                        self.logger.info("Scheduled update completed")
+                    else:
+                        self.logger.error("Scheduled update failed")
+
+                except Exception as e:
+                    self.logger.error(f"Error during scheduled update: {e}")
+
+                next_due += update_interval
+
         except KeyboardInterrupt:
             self.logger.info("Daemon mode interrupted by user")
         except Exception as e:
@@ -212,7 +240,7 @@ def main():
     args = parse_arguments()
     
     # Set up logging
-    logger = setup_logging()
+    logger = setup_logging(daemon=args.daemon)
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -240,8 +268,10 @@ def main():
             app.run_daemon(args.update_interval)
         
         else:
-            # Single update
-            success = app.run_single_update(args.plugin)
+            # Single update, optionally repeated on the same app instance
+            success = True
+            for _ in range(max(1, args.count)):
+                success = app.run_single_update(args.plugin)
             sys.exit(0 if success else 1)
             
     except KeyboardInterrupt:
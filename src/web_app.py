@@ -3,12 +3,39 @@
 Web Interface for eInk InfoDisplay
 """
 import os
+import re
 import sys
 import json
+import atexit
+import signal
+import hashlib
+import queue
+import secrets
+import functools
 import subprocess
+import threading
+import time
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
+from flask import (Flask, Blueprint, Response, render_template, request,
+                   redirect, url_for, jsonify, flash, stream_with_context)
+
+try:
+    from systemd import journal as sd_journal
+except ImportError:
+    sd_journal = None
+
+try:
+    from pystemd.systemd1 import Manager as SdManager, Unit as SdUnit
+except ImportError:
+    SdManager = SdUnit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.absolute()
@@ -18,14 +45,42 @@ from src.config_manager import ConfigManager
 from src.display.plugin_manager import PluginManager
 from src.display.eink_manager import EInkDisplayManager
 
-# Flask app setup
+# Flask app setup; the session key is loaded from config (or minted and
+# persisted there) in initialize_managers so sessions and flashes
+# survive restarts and are shared by every worker process
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+
+# Route jsonify through orjson's C encoder when available; the API
+# polling endpoints otherwise spend their CPU inside json.dumps.
+# flask.json.provider needs Flask >= 2.2, so both imports are optional.
+if orjson is not None:
+    try:
+        from flask.json.provider import DefaultJSONProvider
+    except ImportError:
+        DefaultJSONProvider = None
+
+    if DefaultJSONProvider is not None:
+        class _OrjsonProvider(DefaultJSONProvider):
+            """JSON provider backed by orjson"""
+
+            def dumps(self, obj, **kwargs):
+                return orjson.dumps(obj, default=self.default).decode()
+
+            def loads(self, s, **kwargs):
+                return orjson.loads(s)
+
+        app.json = _OrjsonProvider(app)
 
 # Template and static folders
 app.template_folder = str(project_root / "templates")
 app.static_folder = str(project_root / "static")
 
+# Page and API handlers live on blueprints; initialization happens once
+# in a before_request hook instead of an almost-always-false None check
+# at the top of every route
+pages_bp = Blueprint('pages', __name__)
+api_bp = Blueprint('api', __name__, url_prefix='/api')
+
 # Global instances
 config_manager = None
 plugin_manager = None
@@ -38,29 +93,322 @@ def initialize_managers():
     try:
         config_path = project_root / "config.json"
         config_manager = ConfigManager(str(config_path))
-        
+
+        # A stable signing key: per-process os.urandom would invalidate
+        # every session and pending flash on restart (and disagree
+        # between workers), so mint one once and keep it in config
+        web_config = config_manager.get_section('web', {})
+        secret_key = web_config.get('secret_key')
+        if not secret_key:
+            secret_key = secrets.token_hex(32)
+            web_config['secret_key'] = secret_key
+            config_manager.update_section('web', web_config)
+            config_manager.save_config()
+        app.secret_key = secret_key
+
         display_manager = EInkDisplayManager(config_manager)
         plugin_manager = PluginManager(config_manager, display_manager)
-        
+
+        _cached_config.cache_clear()
+        _register_shutdown()
         return True
     except Exception as e:
+        if not app.secret_key:
+            app.secret_key = os.urandom(24)
         app.logger.error(f"Failed to initialize managers: {e}")
         return False
 
-def get_service_status():
-    """Get the status of the eInk display service"""
+@functools.lru_cache(maxsize=1)
+def _cached_config():
+    return config_manager.get_all_config()
+
+_config_mtime = 0.0
+
+def _get_all_config():
+    """Serve the full config from memory, reloading config.json only
+    when its mtime moves (e.g. saved by another worker or the daemon);
+    one stat beats a JSON reparse per view"""
+    global _config_mtime
+    try:
+        mtime = os.stat(config_manager.config_path).st_mtime
+    except OSError:
+        mtime = 0.0
+    if mtime != _config_mtime:
+        _config_mtime = mtime
+        config_manager.reload_config()
+        _cached_config.cache_clear()
+    return _cached_config()
+
+_initialized = False
+_init_lock = threading.Lock()
+
+@app.before_request
+def _ensure_initialized():
+    """Initialize the managers once, before the first request"""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized and initialize_managers():
+            _initialized = True
+
+# Small pool so views can overlap their independent blocking reads
+# (service status, plugin status, journal logs) instead of paying for
+# them back to back; each leg may block on D-Bus, the journal, or a fork
+_view_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='web-view')
+
+# Short-TTL caches for the poll-heavy status and log reads; a dashboard
+# refreshing at 1 Hz would otherwise fork systemctl/journalctl per poll
+_STATUS_TTL = 1.5
+_status_cache = {'value': None, 'expires': 0.0}
+_status_lock = threading.Lock()
+_logs_cache = {}
+_logs_lock = threading.Lock()
+
+def _invalidate_status_cache():
+    """Drop the cached status so control actions show fresh state"""
+    _status_cache['expires'] = 0.0
+
+# In-process D-Bus client to systemd; issuing StartUnit/StopUnit
+# directly skips the sudo+systemctl fork, exec, and PAM round trip.
+# Requires a polkit rule granting the web-app user manage-units on the
+# display service; otherwise the subprocess path is used.
+_sd_manager = None
+_sd_unit = None
+_sd_lock = threading.Lock()
+
+def _get_sd_manager():
+    """Load the shared pystemd Manager proxy once"""
+    global _sd_manager
+    if _sd_manager is None:
+        manager = SdManager()
+        manager.load()
+        _sd_manager = manager
+    return _sd_manager
+
+def _get_sd_unit():
+    """Load the display service unit proxy once"""
+    global _sd_unit
+    if _sd_unit is None:
+        unit = SdUnit(b"eink-display.service")
+        unit.load()
+        _sd_unit = unit
+    return _sd_unit
+
+# One worker owns every service-control fork; request threads submit an
+# action and wait on its Future, so concurrent control clicks serialize
+# into one systemctl at a time instead of racing each other
+_control_queue = queue.Queue()
+_control_thread = None
+_control_thread_lock = threading.Lock()
+
+def _control_worker():
+    """Consume (action, Future) pairs and run them one at a time"""
+    while True:
+        action, future = _control_queue.get()
+        try:
+            future.set_result(_run_control(action))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            _control_queue.task_done()
+
+def _control_service(action):
+    """Start/stop/restart the display service via the control worker
+
+    Args:
+        action: One of 'start', 'stop' or 'restart'
+
+    Returns:
+        Tuple of (success, output, error)
+    """
+    global _control_thread
+    if _control_thread is None:
+        with _control_thread_lock:
+            if _control_thread is None:
+                worker = threading.Thread(target=_control_worker,
+                                          daemon=True,
+                                          name='service-control')
+                worker.start()
+                _control_thread = worker
+
+    future = Future()
+    _control_queue.put((action, future))
+    return future.result(timeout=30)
+
+def _run_control(action):
+    """Issue a start/stop/restart to systemd (worker thread only)"""
+    if SdManager is not None:
+        try:
+            with _sd_lock:
+                manager = _get_sd_manager()
+                method = {'start': manager.Manager.StartUnit,
+                          'stop': manager.Manager.StopUnit,
+                          'restart': manager.Manager.RestartUnit}[action]
+                method(b"eink-display.service", b"replace")
+            return True, '', ''
+        except Exception as e:
+            app.logger.warning(f"D-Bus service control failed, using systemctl: {e}")
+
     try:
         result = subprocess.run(
-            ["systemctl", "is-active", "eink-display.service"],
-            capture_output=True, text=True, timeout=5
+            ["sudo", "systemctl", action, "eink-display.service"],
+            capture_output=True, text=True, timeout=30
         )
-        return result.stdout.strip() == "active"
-    except Exception:
-        return False
+        return result.returncode == 0, result.stdout, result.stderr
+    except Exception as e:
+        return False, '', str(e)
+
+# Liveness fast path: a running unit has processes listed in its cgroup
+# membership file; reading it is a microsecond open/read/close with no
+# fork and no D-Bus round trip
+_CGROUP_PROCS = "/sys/fs/cgroup/system.slice/eink-display.service/cgroup.procs"
+
+def get_service_status():
+    """Get the status of the eInk display service (cached briefly)"""
+    if time.monotonic() < _status_cache['expires']:
+        return _status_cache['value']
+
+    with _status_lock:
+        # Re-check under the lock; another thread may have refreshed
+        if time.monotonic() < _status_cache['expires']:
+            return _status_cache['value']
+
+        value = None
+        try:
+            with open(_CGROUP_PROCS, 'rb') as f:
+                value = bool(f.read().strip())
+        except OSError:
+            # No live cgroup (unit never started since boot, or a v1
+            # hierarchy) - ask systemd instead
+            value = None
+
+        if value is None and SdUnit is not None:
+            try:
+                with _sd_lock:
+                    value = _get_sd_unit().Unit.ActiveState == b"active"
+            except Exception:
+                value = None
+
+        if value is None:
+            try:
+                result = subprocess.run(
+                    ["systemctl", "is-active", "eink-display.service"],
+                    capture_output=True, text=True, timeout=5
+                )
+                value = result.stdout.strip() == "active"
+            except Exception:
+                value = False
+
+        _status_cache['value'] = value
+        _status_cache['expires'] = time.monotonic() + _STATUS_TTL
+        return value
+
+# Persistent journal reader; forking journalctl per request re-opens and
+# re-parses every journal file, while the Reader keeps its descriptors
+# across calls. Guarded by a lock since Flask serves threaded.
+_journal = None
+_journal_lock = threading.Lock()
+
+def _get_journal():
+    """Open the unit-filtered journal reader once and reuse it"""
+    global _journal
+    if _journal is None:
+        reader = sd_journal.Reader()
+        reader.add_match(_SYSTEMD_UNIT="eink-display.service")
+        _journal = reader
+    return _journal
+
+# The log cache is keyed by the requested line count, which arrives
+# from the user-controlled ?lines= parameter - clamp it and evict stale
+# keys so the dict stays bounded in a long-lived worker
+_MAX_LOG_LINES = 1000
+_LOGS_CACHE_MAX = 8
 
 def get_service_logs(lines=20):
-    """Get recent service logs"""
+    """Get recent service logs (cached briefly per line count)"""
+    lines = max(1, min(lines, _MAX_LOG_LINES))
+    cached = _logs_cache.get(lines)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    with _logs_lock:
+        cached = _logs_cache.get(lines)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        logs = _read_service_logs(lines)
+        if len(_logs_cache) >= _LOGS_CACHE_MAX:
+            now = time.monotonic()
+            for key in [k for k, v in _logs_cache.items() if v[0] <= now]:
+                del _logs_cache[key]
+            if len(_logs_cache) >= _LOGS_CACHE_MAX:
+                _logs_cache.clear()
+        _logs_cache[lines] = (time.monotonic() + _STATUS_TTL, logs)
+        return logs
+
+# Without systemd-python, one long-lived `journalctl -f` fills a ring
+# of recent lines so log polls stop forking a subprocess each time. The
+# follower starts lazily on the first fallback read.
+_LOG_RING_SIZE = 2048
+_log_ring = collections.deque(maxlen=_LOG_RING_SIZE)
+_log_ring_lock = threading.Lock()
+_log_follower = None
+_log_follower_thread = None
+
+def _follow_logs(proc):
+    """Drain the journalctl follower into the ring buffer"""
     try:
+        for line in proc.stdout:
+            with _log_ring_lock:
+                _log_ring.append(line.rstrip('\n'))
+    except Exception as e:
+        app.logger.warning(f"Log follower stopped: {e}")
+
+def _ensure_log_follower():
+    """Start the long-lived journalctl follower once (caller holds
+    _logs_lock, so this never races)"""
+    global _log_follower, _log_follower_thread
+    if _log_follower_thread is not None:
+        return
+    proc = subprocess.Popen(
+        ["journalctl", "-fu", "eink-display.service", "--no-pager",
+         "-n", str(_LOG_RING_SIZE)],
+        stdout=subprocess.PIPE, text=True)
+    _log_follower = proc
+    _log_follower_thread = threading.Thread(
+        target=_follow_logs, args=(proc,), daemon=True,
+        name='journal-follow')
+    _log_follower_thread.start()
+
+def _read_service_logs(lines):
+    """Read logs from the journal (or journalctl fallback)"""
+    if sd_journal is not None:
+        try:
+            with _journal_lock:
+                reader = _get_journal()
+                reader.seek_tail()
+                entries = []
+                for _ in range(lines):
+                    entry = reader.get_previous()
+                    if not entry:
+                        break
+                    stamp = entry.get('__REALTIME_TIMESTAMP')
+                    stamp_str = stamp.strftime('%b %d %H:%M:%S') if stamp else ''
+                    entries.append(f"{stamp_str} {entry.get('MESSAGE', '')}")
+                entries.reverse()
+                return entries
+        except Exception as e:
+            app.logger.warning(f"Journal reader failed, using journalctl: {e}")
+
+    try:
+        _ensure_log_follower()
+        with _log_ring_lock:
+            if _log_ring:
+                return list(_log_ring)[-lines:]
+
+        # Ring not warmed yet (the follower just started); do one
+        # regular read while it catches up
         result = subprocess.run(
             ["journalctl", "-u", "eink-display.service", "-n", str(lines), "--no-pager"],
             capture_output=True, text=True, timeout=10
@@ -69,37 +417,36 @@ def get_service_logs(lines=20):
     except Exception as e:
         return [f"Error getting logs: {e}"]
 
-@app.route('/')
+# Leading "Mon DD HH:MM:SS" stamp of a journal line mentioning an
+# update; compiled once so index() scans the log buffer in one pass
+_LAST_UPDATE_RE = re.compile(r'^(\S+\s+\S+\s+\S+).*updated',
+                             re.IGNORECASE | re.MULTILINE)
+
+@pages_bp.route('/')
 def index():
     """Main dashboard page"""
     try:
-        # Initialize if needed
-        if not config_manager:
-            initialize_managers()
-        
-        # Get system status
-        service_status = get_service_status()
-        
-        # Get plugin status
+        # Kick off the status and log reads in parallel, gather plugin
+        # status on this thread, then join
+        status_future = _view_pool.submit(get_service_status)
+        logs_future = _view_pool.submit(get_service_logs, 10)
+
         plugin_status = {}
         if plugin_manager:
             plugin_status = plugin_manager.get_plugin_status()
-        
-        # Get last update times from logs
-        logs = get_service_logs(10)
+
+        service_status = status_future.result()
+
+        # Get last update time from logs; a plain substring test prunes
+        # the common no-match case before the case-insensitive regex
+        logs = logs_future.result()
+        joined = '\n'.join(logs)
         last_update = None
-        for log in logs:
-            if "updated" in log.lower():
-                try:
-                    # Try to extract timestamp
-                    parts = log.split()
-                    if len(parts) >= 3:
-                        timestamp_str = f"{parts[0]} {parts[1]} {parts[2]}"
-                        last_update = timestamp_str
-                        break
-                except:
-                    continue
-        
+        if 'updated' in joined or 'Updated' in joined:
+            match = _LAST_UPDATE_RE.search(joined)
+            if match:
+                last_update = match.group(1)
+
         return render_template('index.html',
                              service_active=service_status,
                              plugins=plugin_status,
@@ -111,16 +458,13 @@ def index():
         flash(f"Error loading dashboard: {e}", "error")
         return render_template('error.html', error=str(e))
 
-@app.route('/plugin/<plugin_name>')
+@pages_bp.route('/plugin/<plugin_name>')
 def run_plugin(plugin_name):
     """Run a specific plugin"""
     try:
-        if not plugin_manager:
-            initialize_managers()
-        
         if plugin_name not in plugin_manager.get_available_plugins():
             flash(f"Plugin '{plugin_name}' not found", "error")
-            return redirect(url_for('index'))
+            return redirect(url_for('pages.index'))
         
         # Run the plugin
         success = plugin_manager.run_plugin(plugin_name, force_update=True)
@@ -130,142 +474,127 @@ def run_plugin(plugin_name):
         else:
             flash(f"Plugin '{plugin_name}' failed to execute", "error")
         
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
     
     except Exception as e:
         app.logger.error(f"Error running plugin {plugin_name}: {e}")
         flash(f"Error running plugin: {e}", "error")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
 
-@app.route('/service/<action>')
+@pages_bp.route('/service/<action>')
 def service_control(action):
     """Control the eInk display service"""
     try:
         if action not in ['start', 'stop', 'restart']:
             flash("Invalid service action", "error")
-            return redirect(url_for('index'))
+            return redirect(url_for('pages.index'))
         
-        # Execute systemctl command
-        result = subprocess.run(
-            ["sudo", "systemctl", action, "eink-display.service"],
-            capture_output=True, text=True, timeout=30
-        )
-        
-        if result.returncode == 0:
+        success, _, error = _control_service(action)
+        _invalidate_status_cache()
+
+        if success:
             flash(f"Service {action} successful", "success")
         else:
-            flash(f"Service {action} failed: {result.stderr}", "error")
+            flash(f"Service {action} failed: {error}", "error")
         
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
     
     except Exception as e:
         app.logger.error(f"Error controlling service: {e}")
         flash(f"Error controlling service: {e}", "error")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
 
-@app.route('/config')
+@pages_bp.route('/config')
 def config_page():
     """Configuration page"""
     try:
-        if not config_manager:
-            initialize_managers()
-        
-        config_data = config_manager.get_all_config()
-        return render_template('config.html', config=config_data)
+        # get_all_config returns a read-only mapping proxy, which
+        # json.dumps would only stringify via default=str (making the
+        # digest depend on dict repr order) - hash a real dict instead
+        config_data = dict(_get_all_config())
+
+        # Never expose the session signing key on the (unauthenticated)
+        # config page or fold it into the ETag
+        web_section = config_data.get('web')
+        if web_section and 'secret_key' in web_section:
+            config_data['web'] = {k: v for k, v in web_section.items()
+                                  if k != 'secret_key'}
+
+        # Same ETag scheme as /api/status: an unchanged config means an
+        # unchanged page, so skip the template render entirely
+        etag = hashlib.blake2b(
+            json.dumps(config_data, sort_keys=True, default=str).encode(),
+            digest_size=16).hexdigest()
+        if request.if_none_match.contains(etag):
+            return '', 304
+
+        response = app.make_response(
+            render_template('config.html', config=config_data))
+        response.set_etag(etag)
+        return response
     
     except Exception as e:
         app.logger.error(f"Error in config route: {e}")
         flash(f"Error loading configuration: {e}", "error")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
+
+def _parse_bool(value):
+    """Parse a form checkbox/select value"""
+    return value == 'true'
+
+def _parse_symbols(value):
+    """Parse a comma-separated symbol list; empty lists are rejected"""
+    symbols = [s.strip().upper() for s in value.split(',') if s.strip()]
+    if not symbols:
+        raise ValueError("no symbols")
+    return symbols
+
+# Form field -> (plugin, setting, parser). save_config walks the posted
+# form once against this table; a parser raising ValueError drops the
+# field, matching the old hand-rolled per-field try/except blocks
+_CONFIG_SCHEMA = {
+    'clock_format_24h': ('clock', 'format_24h', _parse_bool),
+    'clock_show_seconds': ('clock', 'show_seconds', _parse_bool),
+    'weather_city_id': ('weather', 'city_id', int),
+    'weather_units': ('weather', 'units', str),
+    'weather_update_interval': ('weather', 'update_interval', int),
+    'prayer_latitude': ('prayer', 'latitude', float),
+    'prayer_longitude': ('prayer', 'longitude', float),
+    'prayer_method': ('prayer', 'method', int),
+    'stock_symbols': ('stock', 'symbols', _parse_symbols),
+    'stock_update_interval': ('stock', 'update_interval', int),
+}
 
-@app.route('/config/save', methods=['POST'])
+@pages_bp.route('/config/save', methods=['POST'])
 def save_config():
     """Save configuration changes"""
     try:
-        if not config_manager:
-            initialize_managers()
-        
-        # Get form data
-        form_data = request.form.to_dict()
-        
         # Update API keys
         api_keys = {}
         for key in ['openweathermap', 'finnhub']:
-            if f'api_key_{key}' in form_data:
-                value = form_data[f'api_key_{key}'].strip()
-                if value:
-                    api_keys[key] = value
-        
+            value = request.form.get(f'api_key_{key}', '').strip()
+            if value:
+                api_keys[key] = value
+
         if api_keys:
             config_manager.update_section('api_keys', api_keys)
-        
-        # Update plugin settings
+
+        # Update plugin settings in one pass over the posted form
         plugin_settings = {}
-        
-        # Clock plugin
-        if 'clock_format_24h' in form_data:
-            plugin_settings['clock'] = {
-                'format_24h': form_data['clock_format_24h'] == 'true',
-                'show_seconds': form_data.get('clock_show_seconds') == 'true'
-            }
-        
-        # Weather plugin
-        weather_settings = {}
-        if 'weather_city_id' in form_data:
-            try:
-                weather_settings['city_id'] = int(form_data['weather_city_id'])
-            except ValueError:
-                pass
-        if 'weather_units' in form_data:
-            weather_settings['units'] = form_data['weather_units']
-        if 'weather_update_interval' in form_data:
+        for form_key, value in request.form.items():
+            row = _CONFIG_SCHEMA.get(form_key)
+            if row is None:
+                continue
+            plugin, setting, parser = row
             try:
-                weather_settings['update_interval'] = int(form_data['weather_update_interval'])
+                parsed = parser(value)
             except ValueError:
-                pass
-        
-        if weather_settings:
-            plugin_settings['weather'] = weather_settings
-        
-        # Prayer plugin
-        prayer_settings = {}
-        if 'prayer_latitude' in form_data:
-            try:
-                prayer_settings['latitude'] = float(form_data['prayer_latitude'])
-            except ValueError:
-                pass
-        if 'prayer_longitude' in form_data:
-            try:
-                prayer_settings['longitude'] = float(form_data['prayer_longitude'])
-            except ValueError:
-                pass
-        if 'prayer_method' in form_data:
-            try:
-                prayer_settings['method'] = int(form_data['prayer_method'])
-            except ValueError:
-                pass
-        
-        if prayer_settings:
-            plugin_settings['prayer'] = prayer_settings
-        
-        # Stock plugin
-        stock_settings = {}
-        if 'stock_symbols' in form_data:
-            symbols = [s.strip().upper() for s in form_data['stock_symbols'].split(',') if s.strip()]
-            if symbols:
-                stock_settings['symbols'] = symbols
-        if 'stock_update_interval' in form_data:
-            try:
-                stock_settings['update_interval'] = int(form_data['stock_update_interval'])
-            except ValueError:
-                pass
-        
-        if stock_settings:
-            plugin_settings['stock'] = stock_settings
-        
+                continue
+            plugin_settings.setdefault(plugin, {})[setting] = parsed
+
         # Save plugin settings
         if plugin_settings:
-            current_plugins = config_manager.get('plugins', {})
+            current_plugins = config_manager.get_section('plugins', {})
             current_settings = current_plugins.get('settings', {})
             
             for plugin_name, settings in plugin_settings.items():
@@ -279,36 +608,45 @@ def save_config():
         
         # Save configuration
         config_manager.save_config()
-        
+        _cached_config.cache_clear()
+
         flash("Configuration saved successfully", "success")
-        return redirect(url_for('config_page'))
+        return redirect(url_for('pages.config_page'))
     
     except Exception as e:
         app.logger.error(f"Error saving configuration: {e}")
         flash(f"Error saving configuration: {e}", "error")
-        return redirect(url_for('config_page'))
+        return redirect(url_for('pages.config_page'))
 
-@app.route('/logs')
+def _stream_template(template_name, **context):
+    """Render a template as a chunked stream instead of one big string"""
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template(template_name).stream(context)
+    stream.enable_buffering(5)
+    return stream
+
+@pages_bp.route('/logs')
 def logs_page():
     """View system logs"""
     try:
-        lines = request.args.get('lines', 50, type=int)
+        lines = max(1, min(request.args.get('lines', 50, type=int),
+                           _MAX_LOG_LINES))
         logs = get_service_logs(lines)
-        
-        return render_template('logs.html', logs=logs, lines=lines)
-    
+
+        # Stream the render so large ?lines= values never materialize
+        # the whole page in memory before the first byte hits the socket
+        return Response(stream_with_context(
+            _stream_template('logs.html', logs=logs, lines=lines)))
+
     except Exception as e:
         app.logger.error(f"Error in logs route: {e}")
         flash(f"Error loading logs: {e}", "error")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
 
-@app.route('/test')
+@pages_bp.route('/test')
 def test_display():
     """Test the display"""
     try:
-        if not display_manager:
-            initialize_managers()
-        
         success = display_manager.test_display()
         
         if success:
@@ -316,50 +654,57 @@ def test_display():
         else:
             flash("Display test failed", "error")
         
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
     
     except Exception as e:
         app.logger.error(f"Error testing display: {e}")
         flash(f"Error testing display: {e}", "error")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
 
-@app.route('/clear')
+@pages_bp.route('/clear')
 def clear_display():
     """Clear the display"""
     try:
-        if not display_manager:
-            initialize_managers()
-        
         display_manager.clear()
         flash("Display cleared", "success")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
     
     except Exception as e:
         app.logger.error(f"Error clearing display: {e}")
         flash(f"Error clearing display: {e}", "error")
-        return redirect(url_for('index'))
+        return redirect(url_for('pages.index'))
 
 # API Routes
-@app.route('/api/status')
+@api_bp.route('/status')
 def api_status():
     """API endpoint for system status"""
     try:
+        status_future = _view_pool.submit(get_service_status)
+        plugins = plugin_manager.get_plugin_status() if plugin_manager else {}
         status = {
-            'service_active': get_service_status(),
-            'plugins': plugin_manager.get_plugin_status() if plugin_manager else {},
-            'timestamp': datetime.now().isoformat()
+            'service_active': status_future.result(),
+            'plugins': plugins,
         }
-        return jsonify(status)
+
+        # ETag over the state only (no timestamp), so pollers seeing an
+        # unchanged system get a header-only 304 instead of a new body
+        etag = hashlib.blake2b(
+            json.dumps(status, sort_keys=True, default=str).encode(),
+            digest_size=16).hexdigest()
+        if request.if_none_match.contains(etag):
+            return '', 304
+
+        status['timestamp'] = datetime.now().isoformat()
+        response = jsonify(status)
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/plugin/<plugin_name>/run', methods=['POST'])
+@api_bp.route('/plugin/<plugin_name>/run', methods=['POST'])
 def api_run_plugin(plugin_name):
     """API endpoint to run a plugin"""
     try:
-        if not plugin_manager:
-            initialize_managers()
-        
         success = plugin_manager.run_plugin(plugin_name, force_update=True)
         
         return jsonify({
@@ -370,45 +715,132 @@ def api_run_plugin(plugin_name):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/service/<action>', methods=['POST'])
+@api_bp.route('/service/<action>', methods=['POST'])
 def api_service_control(action):
     """API endpoint for service control"""
     try:
         if action not in ['start', 'stop', 'restart']:
             return jsonify({'error': 'Invalid action'}), 400
         
-        result = subprocess.run(
-            ["sudo", "systemctl", action, "eink-display.service"],
-            capture_output=True, text=True, timeout=30
-        )
-        
+        success, output, error = _control_service(action)
+        _invalidate_status_cache()
+
         return jsonify({
-            'success': result.returncode == 0,
-            'message': f"Service {action} {'successful' if result.returncode == 0 else 'failed'}",
-            'output': result.stdout,
-            'error': result.stderr
+            'success': success,
+            'message': f"Service {action} {'successful' if success else 'failed'}",
+            'output': output,
+            'error': error
         })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Release the long-lived resources exactly once on SIGTERM/exit so
+# systemd sees a clean, fast shutdown instead of waiting out lingering
+# FDs and the TERM->KILL grace period; that wait is most of the
+# /service/restart latency
+_shutdown_done = False
+_shutdown_registered = False
+
+def _shutdown():
+    """Close long-lived handles at process exit (idempotent)"""
+    global _shutdown_done
+    if _shutdown_done:
+        return
+    _shutdown_done = True
+
+    if _log_follower is not None:
+        try:
+            _log_follower.terminate()
+            _log_follower.wait(1)
+        except Exception:
+            pass
+
+    if _journal is not None:
+        try:
+            _journal.close()
+        except Exception:
+            pass
+
+    _view_pool.shutdown(wait=False)
+
+    if plugin_manager:
+        try:
+            plugin_manager.cleanup()
+        except Exception:
+            pass
+
+    if display_manager:
+        try:
+            display_manager.cleanup()
+        except Exception:
+            pass
+
+def _register_shutdown():
+    """Hook _shutdown into atexit and SIGTERM once"""
+    global _shutdown_registered
+    if _shutdown_registered:
+        return
+    _shutdown_registered = True
+    atexit.register(_shutdown)
+    try:
+        signal.signal(signal.SIGTERM,
+                      lambda *_: (_shutdown(), sys.exit(0)))
+    except ValueError:
+        # Initialization ran off the main thread (before_request under
+        # a threaded server); atexit still covers normal exit
+        pass
+
+app.register_blueprint(pages_bp)
+app.register_blueprint(api_bp)
+
 def main():
     """Main entry point for web application"""
-    # Initialize managers
-    if not initialize_managers():
-        print("Warning: Could not initialize all managers")
-    
-    # Get web configuration
-    web_config = config_manager.get('web', {}) if config_manager else {}
+    # Read just the web section for host/port; the managers themselves
+    # are initialized lazily by the before_request hook (and so by each
+    # gunicorn worker in its own process)
+    try:
+        web_config = ConfigManager(
+            str(project_root / "config.json")).get_section('web', {})
+    except Exception:
+        web_config = {}
     host = web_config.get('host', '0.0.0.0')
     port = web_config.get('port', 8080)
-    debug = web_config.get('debug', False)
-    
+
+    # Debug mode only when explicitly developing: the Werkzeug reloader
+    # stats every loaded source file twice a second, a real baseline
+    # cost on a Pi, so a stray 'debug: true' in config must not enable
+    # it in production
+    debug = (web_config.get('debug', False)
+             and os.environ.get('EINK_ENV') == 'dev')
+
     print(f"Starting eInk InfoDisplay Web Interface...")
     print(f"Access at: http://{host if host != '0.0.0.0' else 'localhost'}:{port}")
-    
+
+    if not debug:
+        # Hand the process over to gunicorn when it is installed; the
+        # systemd unit keeps launching this script either way
+        os.environ.setdefault('PYTHONPATH', str(project_root))
+        try:
+            os.execvp("gunicorn", [
+                "gunicorn", "-c", str(project_root / "gunicorn.conf.py"),
+                "--bind", f"{host}:{port}",
+                "src.web_app:app",
+            ])
+        except OSError:
+            print("gunicorn not found, using the built-in server")
+
+    # Built-in server path (debug, or gunicorn unavailable)
+    if not initialize_managers():
+        print("Warning: Could not initialize all managers")
+
     try:
-        app.run(host=host, port=port, debug=debug)
+        # One OS thread per in-flight request; the routes are I/O-bound
+        # (D-Bus, journal, config file I/O) so this services concurrent
+        # /api/status pollers without an ASGI migration. Revisit Quart +
+        # Hypercorn if poller counts ever outgrow a thread per request.
+        app.run(host=host, port=port, debug=debug, threaded=True,
+                use_reloader=debug, use_debugger=debug)
     except KeyboardInterrupt:
         print("\nWeb interface stopped by user")
     except Exception as e: